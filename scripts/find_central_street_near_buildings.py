@@ -2,47 +2,52 @@
 """Find central streets near buildings."""
 
 import sys
-import yaml
+from pathlib import Path
 import math
+from operator import itemgetter
+
+import numpy as np
+
+# Share the spawn point loader (and its cache) with the osm_city_pipeline package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+from osm_city_pipeline.spawn_points import load_spawn_points, map_center, plane_arrays
 
 def find_central_street_near_buildings(spawn_file, num_results=5):
     """Find streets closest to true map center."""
-    with open(spawn_file, 'r') as f:
-        data = yaml.safe_load(f)
+    data = load_spawn_points(spawn_file)
     
     spawn_points = data['spawn_points']
     
-    # Calculate true map center
-    all_east = [sp['position']['east'] for sp in spawn_points]
-    all_north = [sp['position']['north'] for sp in spawn_points]
-    true_center_east = (min(all_east) + max(all_east)) / 2
-    true_center_north = (min(all_north) + max(all_north)) / 2
+    east, north = plane_arrays(spawn_points)
+    
+    # True map center
+    true_center_east, true_center_north = map_center(spawn_points)
     
     print(f"True map center: ({true_center_east:.1f}, {true_center_north:.1f})")
     print()
     
-    # Group spawn points by street
-    streets = {}
-    for sp in spawn_points:
-        road_name = sp.get('road_name', 'Unnamed')
-        if road_name not in streets:
-            streets[road_name] = []
-        streets[road_name].append(sp)
+    # Squared distance of every spawn point from the true center, in one pass
+    dist_sq = (east - true_center_east) ** 2 + (north - true_center_north) ** 2
+    
+    # Number streets in first-seen order and tag each spawn point with its street
+    street_ids = {}
+    road_id = np.fromiter(
+        (street_ids.setdefault(sp.get('road_name', 'Unnamed'), len(street_ids)) for sp in spawn_points),
+        dtype=np.intp, count=len(spawn_points)
+    )
+    
+    # For each street, find spawn closest to true center: after a stable sort by
+    # (street, distance) the first entry of every street is its closest spawn
+    order = np.lexsort((dist_sq, road_id))
+    _, first = np.unique(road_id[order], return_index=True)
+    closest = order[first]
     
-    # For each street, find spawn closest to true center
-    street_distances = []
-    for road_name, street_spawns in streets.items():
-        closest_dist = float('inf')
-        closest_sp = None
-        for sp in street_spawns:
-            pos = sp['position']
-            dist = math.sqrt((pos['east'] - true_center_east)**2 + (pos['north'] - true_center_north)**2)
-            if dist < closest_dist:
-                closest_dist = dist
-                closest_sp = sp
-        street_distances.append((closest_dist, road_name, closest_sp))
+    street_distances = [
+        (math.sqrt(d), road_name, spawn_points[i])
+        for road_name, i, d in zip(street_ids, closest.tolist(), dist_sq[closest].tolist())
+    ]
     
-    street_distances.sort(key=lambda x: x[0])
+    street_distances.sort(key=itemgetter(0))
     
     print(f"Streets closest to TRUE map center (near buildings in city center):")
     print("="*70)
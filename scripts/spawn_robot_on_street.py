@@ -4,11 +4,17 @@ Spawn the saye robot on a specific street in Gazebo.
 Creates an SDF file with the city model and the robot positioned on the requested street.
 """
 
+import math
 import sys
-import yaml
 from pathlib import Path
 from xml.etree import ElementTree as ET
-from xml.dom import minidom
+
+import numpy as np
+
+# Share the spawn point loader (and its cache) with the osm_city_pipeline package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+from osm_city_pipeline.spawn_points import load_spawn_points, match_street, map_center, plane_arrays
+from osm_city_pipeline.sdf_world import create_world_element
 
 
 def create_robot_spawn_sdf(spawn_file: str, street_name: str, output_file: str, 
@@ -16,17 +22,12 @@ def create_robot_spawn_sdf(spawn_file: str, street_name: str, output_file: str,
     """Create SDF with robot spawned on specific street."""
     
     # Load spawn points
-    with open(spawn_file, 'r') as f:
-        spawn_data = yaml.safe_load(f)
+    spawn_data = load_spawn_points(spawn_file)
     
     spawn_points = spawn_data['spawn_points']
     
     # Find spawn points on this street
-    matching = []
-    for sp in spawn_points:
-        road_name = sp.get('road_name', '')
-        if street_name.lower() in road_name.lower() or road_name.lower() in street_name.lower():
-            matching.append(sp)
+    matching = match_street(spawn_points, street_name, spawn_data.get('_road_index'))
     
     if not matching:
         print(f"❌ No spawn points found for street: {street_name}")
@@ -43,32 +44,23 @@ def create_robot_spawn_sdf(spawn_file: str, street_name: str, output_file: str,
         return 1
     
     # Use spawn point closest to TRUE map center (not 0,0 but actual center of map)
-    import math
-    
-    # Calculate true map center from all spawn points
-    all_east = [sp['position']['east'] for sp in spawn_points]
-    all_north = [sp['position']['north'] for sp in spawn_points]
-    true_center_east = (min(all_east) + max(all_east)) / 2
-    true_center_north = (min(all_north) + max(all_north)) / 2
-    
-    closest_to_center = None
-    min_dist_to_center = float('inf')
-    for sp in matching:
-        pos = sp['position']
-        # Distance from TRUE map center (not 0,0)
-        dist = math.sqrt((pos['east'] - true_center_east)**2 + (pos['north'] - true_center_north)**2)
-        if dist < min_dist_to_center:
-            min_dist_to_center = dist
-            closest_to_center = sp
-    
-    spawn_point = closest_to_center
+    if len(matching) == 1:
+        # Nothing to choose between; skip the map center entirely
+        spawn_point = matching[0]
+    else:
+        true_center_east, true_center_north = map_center(spawn_data['spawn_points'])
+        
+        # Distance from TRUE map center (not 0,0); squared distance has the same argmin
+        match_east, match_north = plane_arrays(matching)
+        dist_sq = (match_east - true_center_east) ** 2 + (match_north - true_center_north) ** 2
+        spawn_point = matching[int(np.argmin(dist_sq))]
     pos = spawn_point['position']
-    orient = spawn_point.get('orientation', {})
-    yaw = orient.get('yaw', 0.0)
+    east, north, up = pos['east'], pos['north'], pos['up']
+    yaw = spawn_point['_yaw']
     
     print(f"✅ Found spawn point on: {spawn_point.get('road_name', street_name)}")
-    print(f"   Position: ({pos['east']:.3f}, {pos['north']:.3f}, {pos['up']:.3f})")
-    print(f"   Yaw: {yaw:.3f} rad ({yaw * 180 / 3.14159:.1f} deg)")
+    print(f"   Position: ({east:.3f}, {north:.3f}, {up:.3f})")
+    print(f"   Yaw: {yaw:.3f} rad ({math.degrees(yaw):.1f} deg)")
     print(f"   Creating SDF with robot...")
     
     # Determine robot model path
@@ -79,43 +71,10 @@ def create_robot_spawn_sdf(spawn_file: str, street_name: str, output_file: str,
             # Try alternative path
             robot_model_path = Path("/workspace/osm_city_pipeline/saye_description/models/saye/model.sdf")
     
-    # Create SDF
-    sdf = ET.Element('sdf', version='1.11')
-    world = ET.SubElement(sdf, 'world', name='robot_spawn_test')
-    
-    # Add physics
-    physics = ET.SubElement(world, 'physics')
-    physics.set('type', 'ode')
-    physics.set('name', 'default')
-    max_step_size = ET.SubElement(physics, 'max_step_size')
-    max_step_size.text = '0.001'
-    real_time_factor = ET.SubElement(physics, 'real_time_factor')
-    real_time_factor.text = '1.0'
-    gravity_elem = ET.SubElement(physics, 'gravity')
-    gravity_elem.text = '0 0 -9.81'
-    
-    # Add plugins
-    plugin_physics = ET.SubElement(world, 'plugin')
-    plugin_physics.set('filename', 'gz-sim-physics-system')
-    plugin_physics.set('name', 'gz::sim::systems::Physics')
-    
-    plugin_sensors = ET.SubElement(world, 'plugin')
-    plugin_sensors.set('filename', 'gz-sim-sensors-system')
-    plugin_sensors.set('name', 'gz::sim::systems::Sensors')
-    render_engine = ET.SubElement(plugin_sensors, 'render_engine')
-    render_engine.text = 'ogre2'  # Use OGRE2 instead of vulkan (more compatible)
-    
-    plugin_scene = ET.SubElement(world, 'plugin')
-    plugin_scene.set('filename', 'gz-sim-scene-broadcaster-system')
-    plugin_scene.set('name', 'gz::sim::systems::SceneBroadcaster')
-    
-    plugin_user = ET.SubElement(world, 'plugin')
-    plugin_user.set('filename', 'gz-sim-user-commands-system')
-    plugin_user.set('name', 'gz::sim::systems::UserCommands')
-    
-    plugin_imu = ET.SubElement(world, 'plugin')
-    plugin_imu.set('filename', 'gz-sim-imu-system')
-    plugin_imu.set('name', 'gz::sim::systems::Imu')
+    # Create SDF with physics and Gazebo Harmonic system plugins
+    # Use OGRE2 instead of vulkan (more compatible)
+    sdf = create_world_element('robot_spawn_test', render_engine='ogre2')
+    world = sdf.find('world')
     
     # Include the city model
     include_city = ET.SubElement(world, 'include')
@@ -143,8 +102,8 @@ def create_robot_spawn_sdf(spawn_file: str, street_name: str, output_file: str,
     # Robot pose - positioned on the street
     pose_robot = ET.SubElement(include_robot, 'pose')
     # Position robot on the street (0.1m above ground for wheels to touch road)
-    robot_z = pos['up'] + 0.1
-    pose_robot.text = f"{pos['east']:.6f} {pos['north']:.6f} {robot_z:.6f} 0 0 {yaw:.6f}"
+    robot_z = up + 0.1
+    pose_robot.text = f"{east:.6f} {north:.6f} {robot_z:.6f} 0 0 {yaw:.6f}"
     
     # Add camera positioned ON THE STREET to view the robot
     gui = ET.SubElement(world, 'gui')
@@ -159,8 +118,8 @@ def create_robot_spawn_sdf(spawn_file: str, street_name: str, output_file: str,
     # Calculate position behind robot based on yaw
     cam_offset_x = -5.0 * (1.0 if abs(yaw) < 1.57 else -1.0)  # Behind robot
     cam_offset_y = 0.0
-    cam_x = pos['east'] + cam_offset_x * (1.0 if abs(yaw) < 1.57 else -1.0)
-    cam_y = pos['north'] + cam_offset_y
+    cam_x = east + cam_offset_x * (1.0 if abs(yaw) < 1.57 else -1.0)
+    cam_y = north + cam_offset_y
     cam_z = 2.0  # Camera height on street (2m above ground)
     # Look at robot (pitch down slightly to see robot and street)
     pose_cam.text = f'{cam_x:.2f} {cam_y:.2f} {cam_z:.2f} 0 -0.3 {yaw:.2f}'
@@ -177,21 +136,23 @@ def create_robot_spawn_sdf(spawn_file: str, street_name: str, output_file: str,
     track_visual = ET.SubElement(camera_follow, 'track_visual')
     track_visual.text = 'saye::base_link::BaseVisual'
     
-    # Format XML
-    xml_str = ET.tostring(sdf, encoding='unicode')
-    reparsed = minidom.parseString(xml_str)
+    # Format XML (indent in place rather than re-parsing through minidom)
+    ET.indent(sdf, space='  ')
     
     # Write to file
     output_path = Path(output_file)
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
+    # Serialize straight into the file rather than via an intermediate string
     with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(reparsed.toprettyxml(indent='  '))
+        f.write('<?xml version="1.0" ?>\n')
+        ET.ElementTree(sdf).write(f, encoding='unicode')
+        f.write('\n')
     
     print(f"✅ SDF created: {output_file}")
     print(f"   Robot spawned on: {spawn_point.get('road_name', street_name)}")
-    print(f"   Robot position: ({pos['east']:.3f}, {pos['north']:.3f}, {robot_z:.3f})")
-    print(f"   Robot orientation: {yaw:.3f} rad ({yaw * 180 / 3.14159:.1f} deg)")
+    print(f"   Robot position: ({east:.3f}, {north:.3f}, {robot_z:.3f})")
+    print(f"   Robot orientation: {yaw:.3f} rad ({math.degrees(yaw):.1f} deg)")
     print(f"\nTo visualize:")
     print(f"  source /opt/ros/jazzy/setup.bash")
     print(f"  export GZ_SIM_RESOURCE_PATH=$GZ_SIM_RESOURCE_PATH:$(pwd)/models:$(pwd)/saye_description")
@@ -9,30 +9,27 @@ import json
 import math
 import os
 
-# Handle both package and direct execution
 try:
-    from .gis_projection import project_to_enu, create_enu_from_osm, ENUProjection
-    from .road_extractor import extract_road_metadata, extract_and_save_road_metadata
-    from .sdf_generator import generate_sdf_world
-    from .metadata_exporter import export_all_metadata, export_roads_json, export_spawn_points_yaml
-    from .debug_tools import generate_debug_camera_sdf, generate_debug_spawn_sdf
-    from .camera_utils import get_world_center_camera_pose, calculate_camera_pose_for_spawn_point
+    import orjson
 except ImportError:
+    orjson = None
+
+# Handle both package and direct execution. Subcommands import the modules
+# they need when they run, so e.g. reset or --help do not load pyproj/numpy.
+if not __package__:
     # If running as script, add src directory to path
-    import os
     script_dir = os.path.dirname(os.path.abspath(__file__))
     src_dir = os.path.join(script_dir, '..', '..')
     sys.path.insert(0, os.path.abspath(src_dir))
-    from osm_city_pipeline.gis_projection import project_to_enu, create_enu_from_osm, ENUProjection
-    from osm_city_pipeline.road_extractor import extract_road_metadata, extract_and_save_road_metadata
-    from osm_city_pipeline.sdf_generator import generate_sdf_world
-    from osm_city_pipeline.metadata_exporter import export_all_metadata, export_roads_json, export_spawn_points_yaml
-    from osm_city_pipeline.debug_tools import generate_debug_camera_sdf, generate_debug_spawn_sdf
-    from osm_city_pipeline.camera_utils import get_world_center_camera_pose, calculate_camera_pose_for_spawn_point
 
 
 def test_projection(args):
     """Test ENU projection with given coordinates."""
+    try:
+        from .gis_projection import project_to_enu, create_enu_from_osm
+    except ImportError:
+        from osm_city_pipeline.gis_projection import project_to_enu, create_enu_from_osm
+    
     lat = args.lat
     lon = args.lon
     h = args.height if args.height is not None else 0.0
@@ -57,9 +54,13 @@ def test_projection(args):
         print(f"Using input point as center: ({center_lat}, {center_lon})")
     
     try:
-        # Project to ENU
+        # Project to ENU (keep the OSM projection to report its center below)
+        enu_proj = None
         if osm_file_path:
-            east, north, up = project_to_enu(lat, lon, h, osm_file_path=osm_file_path)
+            enu_proj = create_enu_from_osm(osm_file_path)
+            if enu_proj is None:
+                raise ValueError(f"Could not determine bounds from OSM file: {osm_file_path}")
+            east, north, up = enu_proj.project_to_enu(lat, lon, h)
         else:
             east, north, up = project_to_enu(lat, lon, h, 
                                             center_lat=center_lat, 
@@ -81,12 +82,10 @@ def test_projection(args):
         print("="*60)
         
         # If using OSM file, show the center point
-        if osm_file_path:
-            enu_proj = create_enu_from_osm(osm_file_path)
-            if enu_proj:
-                print(f"\nProjection center (OSM bounding box center):")
-                print(f"  Latitude:  {enu_proj.center_lat:.8f}°")
-                print(f"  Longitude: {enu_proj.center_lon:.8f}°")
+        if enu_proj:
+            print(f"\nProjection center (OSM bounding box center):")
+            print(f"  Latitude:  {enu_proj.center_lat:.8f}°")
+            print(f"  Longitude: {enu_proj.center_lon:.8f}°")
         
         return 0
     
@@ -97,6 +96,11 @@ def test_projection(args):
 
 def extract_roads(args):
     """Extract roads from OSM file and save metadata."""
+    try:
+        from .road_extractor import extract_and_save_road_metadata
+    except ImportError:
+        from osm_city_pipeline.road_extractor import extract_and_save_road_metadata
+    
     osm_file = args.osm_file
     output_file = args.output
     
@@ -159,10 +163,8 @@ def generate_world(args):
         print("")
         
         # Delete old file if exists (RULE 4: regenerate)
-        output_path = Path(output_file)
-        if output_path.exists():
+        if _remove_file(output_file):
             print(f"Removing old world file: {output_file}")
-            output_path.unlink()
         
         # Try enhanced generation first (with OSM2World mesh)
         if use_enhanced:
@@ -211,7 +213,7 @@ def generate_world(args):
         print("="*60)
         print(f"World file: {output_file}")
         print(f"World name: {world_name}")
-        print(f"File size: {output_path.stat().st_size} bytes")
+        print(f"File size: {os.path.getsize(output_file)} bytes")
         print("")
         if use_enhanced:
             print("World includes:")
@@ -238,23 +240,27 @@ def generate_world(args):
 
 def export_metadata(args):
     """Export roads.json and spawn_points.yaml metadata."""
+    try:
+        from .metadata_exporter import export_all_metadata
+    except ImportError:
+        from osm_city_pipeline.metadata_exporter import export_all_metadata
+    
     osm_file = args.osm_file
     roads_output = args.roads_output
     spawn_output = args.spawn_output
     spawn_spacing = args.spawn_spacing
     
     # Default output paths
-    if roads_output is None:
-        osm_path = Path(osm_file)
-        maps_dir = Path('maps')
-        maps_dir.mkdir(exist_ok=True)
-        roads_output = str(maps_dir / f"{osm_path.stem}_roads.json")
-    
-    if spawn_output is None:
+    if roads_output is None or spawn_output is None:
         osm_path = Path(osm_file)
         maps_dir = Path('maps')
         maps_dir.mkdir(exist_ok=True)
-        spawn_output = str(maps_dir / f"{osm_path.stem}_spawn_points.yaml")
+        
+        if roads_output is None:
+            roads_output = str(maps_dir / f"{osm_path.stem}_roads.json")
+        
+        if spawn_output is None:
+            spawn_output = str(maps_dir / f"{osm_path.stem}_spawn_points.yaml")
     
     try:
         print(f"Exporting metadata from: {osm_file}")
@@ -265,10 +271,8 @@ def export_metadata(args):
         
         # Delete old files if they exist (RULE 4: regenerate)
         for output_file in [roads_output, spawn_output]:
-            output_path = Path(output_file)
-            if output_path.exists():
+            if _remove_file(output_file):
                 print(f"Removing old file: {output_file}")
-                output_path.unlink()
         
         # Export metadata
         roads_data, spawn_points = export_all_metadata(
@@ -299,6 +303,11 @@ def export_metadata(args):
 
 def debug_camera(args):
     """Generate debug SDF with camera marker."""
+    try:
+        from .debug_tools import generate_debug_camera_sdf
+    except ImportError:
+        from osm_city_pipeline.debug_tools import generate_debug_camera_sdf
+    
     osm_file = args.osm_file
     output = args.output
     
@@ -325,10 +334,8 @@ def debug_camera(args):
             print("Using world center camera position")
         
         # Delete old file if exists (RULE 4)
-        output_path = Path(output)
-        if output_path.exists():
+        if _remove_file(output):
             print(f"Removing old file: {output}")
-            output_path.unlink()
         
         # Generate debug SDF
         generate_debug_camera_sdf(osm_file, output, camera_pose)
@@ -355,6 +362,11 @@ def debug_camera(args):
 
 def debug_spawn(args):
     """Generate debug SDF with spawn point markers."""
+    try:
+        from .debug_tools import generate_debug_spawn_sdf
+    except ImportError:
+        from osm_city_pipeline.debug_tools import generate_debug_spawn_sdf
+    
     spawn_file = args.spawn_file
     output = args.output
     
@@ -372,16 +384,14 @@ def debug_spawn(args):
         # Parse spawn IDs if provided
         spawn_ids = None
         if args.spawn_ids:
-            spawn_ids = [int(id.strip()) for id in args.spawn_ids.split(',')]
+            spawn_ids = list(map(int, args.spawn_ids.split(',')))  # int() strips whitespace
             print(f"Visualizing spawn points: {spawn_ids}")
         else:
             print(f"Visualizing first {args.max_points} spawn points")
         
         # Delete old file if exists (RULE 4)
-        output_path = Path(output)
-        if output_path.exists():
+        if _remove_file(output):
             print(f"Removing old file: {output}")
-            output_path.unlink()
         
         # Generate debug SDF
         generate_debug_spawn_sdf(spawn_file, output, spawn_ids, args.max_points)
@@ -407,109 +417,88 @@ def debug_spawn(args):
         return 1
 
 
+def _remove_file(path: str) -> bool:
+    """
+    Delete a file if it exists.
+    
+    Args:
+        path: Path to the file
+    
+    Returns:
+        True if the file was deleted, False if it did not exist
+    """
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        return False
+    return True
+
+
 def reset_world(args):
     """Reset/delete generated world files and metadata."""
     osm_file = args.osm_file
     delete_all = args.all
     
     try:
-        from pathlib import Path
-        import os
         import shutil
         
         osm_path = Path(osm_file)
         base_name = osm_path.stem
         
-        deleted_files = []
-        deleted_dirs = []
-        
-        # Delete world file
-        world_file = Path('worlds') / f"{base_name}.sdf"
-        if world_file.exists():
-            world_file.unlink()
-            deleted_files.append(str(world_file))
-            print(f"Deleted: {world_file}")
-        
-        # Delete metadata files
-        roads_file = Path('maps') / f"{base_name}_roads.json"
-        if roads_file.exists():
-            roads_file.unlink()
-            deleted_files.append(str(roads_file))
-            print(f"Deleted: {roads_file}")
-        
-        spawn_file = Path('maps') / f"{base_name}_spawn_points.yaml"
-        if spawn_file.exists():
-            spawn_file.unlink()
-            deleted_files.append(str(spawn_file))
-            print(f"Deleted: {spawn_file}")
+        deleted_files = set()
+        deleted_dirs = set()
         
-        # Delete model directory (OSM2World conversion output)
-        model_dir = Path('models') / f"{base_name}_3d"
-        if model_dir.exists():
-            shutil.rmtree(model_dir)
-            deleted_dirs.append(str(model_dir))
-            print(f"Deleted directory: {model_dir}")
+        spawn_file = os.path.join('maps', f"{base_name}_spawn_points.yaml")
         
-        # Delete output directory (OSM2World OBJ files)
-        output_dir = Path('outputs') / f"{base_name}_3d"
-        if output_dir.exists():
-            shutil.rmtree(output_dir)
-            deleted_dirs.append(str(output_dir))
-            print(f"Deleted directory: {output_dir}")
+        # World file, metadata files, the parsed spawn points cache written by
+        # load_spawn_points, and debug files
+        for path in (
+            os.path.join('worlds', f"{base_name}.sdf"),
+            os.path.join('maps', f"{base_name}_roads.json"),
+            spawn_file,
+            f"{spawn_file}.cache.json",
+            os.path.join('worlds', "debug_camera.sdf"),
+            os.path.join('worlds', "debug_spawn.sdf"),
+        ):
+            if _remove_file(path):
+                deleted_files.add(path)
+                print(f"Deleted: {path}")
         
-        # Delete debug files
-        debug_camera = Path('worlds') / "debug_camera.sdf"
-        if debug_camera.exists():
-            debug_camera.unlink()
-            deleted_files.append(str(debug_camera))
-            print(f"Deleted: {debug_camera}")
-        
-        debug_spawn = Path('worlds') / "debug_spawn.sdf"
-        if debug_spawn.exists():
-            debug_spawn.unlink()
-            deleted_files.append(str(debug_spawn))
-            print(f"Deleted: {debug_spawn}")
+        # Model directory (OSM2World conversion output) and output directory
+        # (OSM2World OBJ files)
+        for path in (
+            os.path.join('models', f"{base_name}_3d"),
+            os.path.join('outputs', f"{base_name}_3d"),
+        ):
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+                deleted_dirs.add(path)
+                print(f"Deleted directory: {path}")
         
         if delete_all:
-            # Delete all files in worlds/ and maps/ (except .osm files)
-            worlds_dir = Path('worlds')
-            if worlds_dir.exists():
-                for f in worlds_dir.glob('*.sdf'):
-                    if f not in deleted_files:
-                        f.unlink()
-                        deleted_files.append(str(f))
-                        print(f"Deleted: {f}")
-            
-            maps_dir = Path('maps')
-            if maps_dir.exists():
-                for f in maps_dir.glob('*.json'):
-                    if f not in deleted_files:
-                        f.unlink()
-                        deleted_files.append(str(f))
-                        print(f"Deleted: {f}")
-                for f in maps_dir.glob('*.yaml'):
-                    if f not in deleted_files:
-                        f.unlink()
-                        deleted_files.append(str(f))
-                        print(f"Deleted: {f}")
-            
-            # Delete all model directories
-            models_dir = Path('models')
-            if models_dir.exists():
-                for d in models_dir.iterdir():
-                    if d.is_dir() and d not in [Path(p) for p in deleted_dirs]:
-                        shutil.rmtree(d)
-                        deleted_dirs.append(str(d))
-                        print(f"Deleted directory: {d}")
+            # Delete all generated files in worlds/ and maps/ (except .osm files),
+            # one directory listing each
+            for dir_name, suffixes in (('worlds', ('.sdf',)),
+                                       ('maps', ('.json', '.yaml'))):
+                if not os.path.isdir(dir_name):
+                    continue
+                with os.scandir(dir_name) as entries:
+                    for entry in entries:
+                        if (entry.name.endswith(suffixes) and entry.path not in deleted_files
+                                and entry.is_file() and _remove_file(entry.path)):
+                            deleted_files.add(entry.path)
+                            print(f"Deleted: {entry.path}")
             
-            # Delete all output directories
-            outputs_dir = Path('outputs')
-            if outputs_dir.exists():
-                for d in outputs_dir.iterdir():
-                    if d.is_dir() and d not in [Path(p) for p in deleted_dirs]:
-                        shutil.rmtree(d)
-                        deleted_dirs.append(str(d))
-                        print(f"Deleted directory: {d}")
+            # Delete all model and output directories
+            for dir_name in ('models', 'outputs'):
+                if not os.path.isdir(dir_name):
+                    continue
+                with os.scandir(dir_name) as entries:
+                    for entry in entries:
+                        if entry.is_dir() and entry.path not in deleted_dirs:
+                            shutil.rmtree(entry.path)
+                            deleted_dirs.add(entry.path)
+                            print(f"Deleted directory: {entry.path}")
         
         print("")
         print("="*60)
@@ -529,26 +518,30 @@ def reset_world(args):
         return 1
 
 
+def _load_json(path: str):
+    """Load a JSON file, with orjson when available."""
+    if orjson is not None:
+        return orjson.loads(Path(path).read_bytes())
+    
+    with open(path, 'rb') as f:
+        return json.load(f)
+
+
 def list_streets(args):
     """List all streets/roads from OSM file or roads.json."""
     try:
-        import json
-        
         roads_data = None
         
         if args.roads_file:
             # Load from roads.json
-            with open(args.roads_file, 'r') as f:
-                roads_data = json.load(f)
+            roads_data = _load_json(args.roads_file)
         elif args.osm_file:
-            # Extract from OSM file
-            from .metadata_exporter import export_roads_json
-            import tempfile
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as tmp:
-                export_roads_json(args.osm_file, tmp.name)
-                with open(tmp.name, 'r') as f:
-                    roads_data = json.load(f)
-                os.unlink(tmp.name)
+            # Extract from OSM file (in memory, no roads.json round trip)
+            try:
+                from .metadata_exporter import extract_roads_data
+            except ImportError:
+                from osm_city_pipeline.metadata_exporter import extract_roads_data
+            roads_data = extract_roads_data(args.osm_file)
         else:
             print("Error: Either --osm-file or --roads-file must be provided", file=sys.stderr)
             return 1
@@ -566,13 +559,13 @@ def list_streets(args):
             print(f"Named roads: {len(roads)}")
         print("")
         
-        for i, road in enumerate(roads, 1):
-            name = road.get('name', 'Unnamed')
-            way_id = road.get('way_id', 'N/A')
-            hw_type = road.get('highway_type', 'unknown')
-            lanes = road.get('lanes', 1)
-            print(f"{i:3d}. {name}")
-            print(f"     Way ID: {way_id}, Type: {hw_type}, Lanes: {lanes}")
+        # Format all rows first and write them in one call
+        sys.stdout.write(''.join(
+            f"{i:3d}. {road.get('name', 'Unnamed')}\n"
+            f"     Way ID: {road.get('way_id', 'N/A')}, Type: {road.get('highway_type', 'unknown')}, "
+            f"Lanes: {road.get('lanes', 1)}\n"
+            for i, road in enumerate(roads, 1)
+        ))
         
         print("="*60)
         
@@ -588,21 +581,21 @@ def list_streets(args):
 def spawn_pose(args):
     """Get spawn point pose by ID."""
     try:
-        import yaml
-        
-        with open(args.spawn_file, 'r') as f:
-            spawn_data = yaml.safe_load(f)
+        from .spawn_points import load_spawn_points
+    except ImportError:
+        from osm_city_pipeline.spawn_points import load_spawn_points
+    
+    try:
+        spawn_data = load_spawn_points(args.spawn_file)
         
-        spawn_points = spawn_data['spawn_points']
-        spawn_point = next((sp for sp in spawn_points if sp['id'] == args.id), None)
+        spawn_point = spawn_data['_by_id'].get(args.id)
         
         if spawn_point is None:
             print(f"Error: Spawn point with ID {args.id} not found", file=sys.stderr)
             return 1
         
         pos = spawn_point['position']
-        orient = spawn_point.get('orientation', {})
-        yaw = orient.get('yaw', 0.0)
+        yaw = spawn_point['_yaw']
         
         print("="*60)
         print(f"Spawn Point {args.id}")
@@ -635,20 +628,18 @@ def spawn_pose(args):
 def spawn_on_street(args):
     """Get spawn points for a specific street."""
     try:
-        import yaml
-        
-        with open(args.spawn_file, 'r') as f:
-            spawn_data = yaml.safe_load(f)
+        from .spawn_points import load_spawn_points, match_street
+    except ImportError:
+        from osm_city_pipeline.spawn_points import load_spawn_points, match_street
+    
+    try:
+        spawn_data = load_spawn_points(args.spawn_file)
         
         spawn_points = spawn_data['spawn_points']
         street_name = args.street_name
         
         # Find spawn points on this street
-        matching = []
-        for sp in spawn_points:
-            road_name = sp.get('road_name', '')
-            if street_name.lower() in road_name.lower() or road_name.lower() in street_name.lower():
-                matching.append(sp)
+        matching = match_street(spawn_points, street_name, spawn_data.get('_road_index'))
         
         if not matching:
             print(f"❌ No spawn points found for street: {street_name}")
@@ -673,11 +664,10 @@ def spawn_on_street(args):
         if args.all:
             for sp in matching:
                 pos = sp['position']
-                orient = sp.get('orientation', {})
-                yaw = orient.get('yaw', 0.0)
+                yaw = sp['_yaw']
                 print(f"Spawn Point {sp['id']}:")
                 print(f"  Position: ({pos['east']:.3f}, {pos['north']:.3f}, {pos['up']:.3f})")
-                print(f"  Yaw: {yaw:.3f} rad ({yaw * 180 / 3.14159:.1f} deg)")
+                print(f"  Yaw: {yaw:.3f} rad ({math.degrees(yaw):.1f} deg)")
                 print(f"  Gazebo Pose: {pos['east']:.6f} {pos['north']:.6f} {pos['up']:.6f} 0 0 {yaw:.6f}")
                 print()
         else:
@@ -685,11 +675,10 @@ def spawn_on_street(args):
             print("First spawn point:")
             sp = matching[0]
             pos = sp['position']
-            orient = sp.get('orientation', {})
-            yaw = orient.get('yaw', 0.0)
+            yaw = sp['_yaw']
             print(f"  ID: {sp['id']}")
             print(f"  Position: ({pos['east']:.3f}, {pos['north']:.3f}, {pos['up']:.3f})")
-            print(f"  Yaw: {yaw:.3f} rad ({yaw * 180 / 3.14159:.1f} deg)")
+            print(f"  Yaw: {yaw:.3f} rad ({math.degrees(yaw):.1f} deg)")
             print(f"  Gazebo Pose: {pos['east']:.6f} {pos['north']:.6f} {pos['up']:.6f} 0 0 {yaw:.6f}")
             print()
             
@@ -697,11 +686,10 @@ def spawn_on_street(args):
                 print("Middle spawn point:")
                 sp = matching[len(matching) // 2]
                 pos = sp['position']
-                orient = sp.get('orientation', {})
-                yaw = orient.get('yaw', 0.0)
+                yaw = sp['_yaw']
                 print(f"  ID: {sp['id']}")
                 print(f"  Position: ({pos['east']:.3f}, {pos['north']:.3f}, {pos['up']:.3f})")
-                print(f"  Yaw: {yaw:.3f} rad ({yaw * 180 / 3.14159:.1f} deg)")
+                print(f"  Yaw: {yaw:.3f} rad ({math.degrees(yaw):.1f} deg)")
                 print(f"  Gazebo Pose: {pos['east']:.6f} {pos['north']:.6f} {pos['up']:.6f} 0 0 {yaw:.6f}")
                 print()
             
@@ -709,11 +697,10 @@ def spawn_on_street(args):
                 print("Last spawn point:")
                 sp = matching[-1]
                 pos = sp['position']
-                orient = sp.get('orientation', {})
-                yaw = orient.get('yaw', 0.0)
+                yaw = sp['_yaw']
                 print(f"  ID: {sp['id']}")
                 print(f"  Position: ({pos['east']:.3f}, {pos['north']:.3f}, {pos['up']:.3f})")
-                print(f"  Yaw: {yaw:.3f} rad ({yaw * 180 / 3.14159:.1f} deg)")
+                print(f"  Yaw: {yaw:.3f} rad ({math.degrees(yaw):.1f} deg)")
                 print(f"  Gazebo Pose: {pos['east']:.6f} {pos['north']:.6f} {pos['up']:.6f} 0 0 {yaw:.6f}")
                 print()
             
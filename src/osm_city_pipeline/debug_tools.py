@@ -2,10 +2,10 @@
 
 from typing import List, Dict, Tuple, Optional
 from xml.etree import ElementTree as ET
-from xml.dom import minidom
 import math
 
 from .gis_projection import create_enu_from_osm, ENUProjection
+from .sdf_world import create_debug_world_element
 
 
 def create_marker_model(name: str, position: Tuple[float, float, float],
@@ -173,41 +173,9 @@ def generate_debug_camera_sdf(osm_file_path: str, output_path: str,
         from .camera_utils import get_world_center_camera_pose
         camera_pose = get_world_center_camera_pose(enu_proj)
     
-    # Create SDF structure
-    sdf = ET.Element('sdf', version='1.11')
-    world = ET.SubElement(sdf, 'world', name='debug_camera')
-    
-    # Add physics
-    physics = ET.SubElement(world, 'physics', type='ode')
-    gravity = ET.SubElement(physics, 'gravity')
-    gravity.text = '0 0 -9.81'
-    
-    # Add scene
-    scene = ET.SubElement(world, 'scene')
-    ambient = ET.SubElement(scene, 'ambient')
-    ambient.text = '0.4 0.4 0.4 1'
-    background = ET.SubElement(scene, 'background')
-    background.text = '0.7 0.7 0.7 1'
-    
-    # Add ground plane
-    ground = ET.SubElement(world, 'model', name='ground_plane')
-    static = ET.SubElement(ground, 'static')
-    static.text = 'true'
-    link = ET.SubElement(ground, 'link', name='link')
-    collision = ET.SubElement(link, 'collision', name='collision')
-    geometry_coll = ET.SubElement(collision, 'geometry')
-    plane_coll = ET.SubElement(geometry_coll, 'plane')
-    normal = ET.SubElement(plane_coll, 'normal')
-    normal.text = '0 0 1'
-    size = ET.SubElement(plane_coll, 'size')
-    size.text = '1000 1000'
-    visual = ET.SubElement(link, 'visual', name='visual')
-    geometry_vis = ET.SubElement(visual, 'geometry')
-    plane_vis = ET.SubElement(geometry_vis, 'plane')
-    normal_vis = ET.SubElement(plane_vis, 'normal')
-    normal_vis.text = '0 0 1'
-    size_vis = ET.SubElement(plane_vis, 'size')
-    size_vis.text = '1000 1000'
+    # Create SDF structure (physics, scene and ground plane)
+    sdf = create_debug_world_element('debug_camera')
+    world = sdf.find('world')
     
     # Add camera marker
     camera_marker = create_camera_marker('camera_marker', camera_pose)
@@ -223,13 +191,13 @@ def generate_debug_camera_sdf(osm_file_path: str, output_path: str,
     output_file = Path(output_path)
     output_file.parent.mkdir(parents=True, exist_ok=True)
     
-    # Format XML
-    xml_str = ET.tostring(sdf, encoding='unicode')
-    dom = minidom.parseString(xml_str)
-    pretty_xml = dom.toprettyxml(indent='  ')
+    # Format XML (indent in place rather than re-parsing through minidom)
+    ET.indent(sdf, space='  ')
     
     with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(pretty_xml)
+        f.write('<?xml version="1.0" ?>\n')
+        ET.ElementTree(sdf).write(f, encoding='unicode')
+        f.write('\n')
     
     return str(output_file)
 
@@ -249,56 +217,24 @@ def generate_debug_spawn_sdf(spawn_points_yaml_path: str, output_path: str,
     Returns:
         Path to generated SDF file
     """
-    import yaml
     from pathlib import Path
+    from .spawn_points import load_spawn_points
     
-    # Load spawn points
-    with open(spawn_points_yaml_path, 'r') as f:
-        spawn_data = yaml.safe_load(f)
+    # Load spawn points (cached next to the YAML)
+    spawn_data = load_spawn_points(spawn_points_yaml_path)
     
     spawn_points = spawn_data['spawn_points']
     
     # Filter spawn points
     if spawn_ids is not None:
-        filtered_points = [sp for sp in spawn_points if sp['id'] in spawn_ids]
+        wanted_ids = set(spawn_ids)
+        filtered_points = [sp for sp in spawn_points if sp['id'] in wanted_ids]
     else:
         filtered_points = spawn_points[:max_spawn_points]
     
-    # Create SDF structure
-    sdf = ET.Element('sdf', version='1.11')
-    world = ET.SubElement(sdf, 'world', name='debug_spawn')
-    
-    # Add physics
-    physics = ET.SubElement(world, 'physics', type='ode')
-    gravity = ET.SubElement(physics, 'gravity')
-    gravity.text = '0 0 -9.81'
-    
-    # Add scene
-    scene = ET.SubElement(world, 'scene')
-    ambient = ET.SubElement(scene, 'ambient')
-    ambient.text = '0.4 0.4 0.4 1'
-    background = ET.SubElement(scene, 'background')
-    background.text = '0.7 0.7 0.7 1'
-    
-    # Add ground plane
-    ground = ET.SubElement(world, 'model', name='ground_plane')
-    static = ET.SubElement(ground, 'static')
-    static.text = 'true'
-    link = ET.SubElement(ground, 'link', name='link')
-    collision = ET.SubElement(link, 'collision', name='collision')
-    geometry_coll = ET.SubElement(collision, 'geometry')
-    plane_coll = ET.SubElement(geometry_coll, 'plane')
-    normal = ET.SubElement(plane_coll, 'normal')
-    normal.text = '0 0 1'
-    size = ET.SubElement(plane_coll, 'size')
-    size.text = '1000 1000'
-    visual = ET.SubElement(link, 'visual', name='visual')
-    geometry_vis = ET.SubElement(visual, 'geometry')
-    plane_vis = ET.SubElement(geometry_vis, 'plane')
-    normal_vis = ET.SubElement(plane_vis, 'normal')
-    normal_vis.text = '0 0 1'
-    size_vis = ET.SubElement(plane_vis, 'size')
-    size_vis.text = '1000 1000'
+    # Create SDF structure (physics, scene and ground plane)
+    sdf = create_debug_world_element('debug_spawn')
+    world = sdf.find('world')
     
     # Add spawn point markers
     for sp in filtered_points:
@@ -336,13 +272,13 @@ def generate_debug_spawn_sdf(spawn_points_yaml_path: str, output_path: str,
     output_file = Path(output_path)
     output_file.parent.mkdir(parents=True, exist_ok=True)
     
-    # Format XML
-    xml_str = ET.tostring(sdf, encoding='unicode')
-    dom = minidom.parseString(xml_str)
-    pretty_xml = dom.toprettyxml(indent='  ')
+    # Format XML (indent in place rather than re-parsing through minidom)
+    ET.indent(sdf, space='  ')
     
     with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(pretty_xml)
+        f.write('<?xml version="1.0" ?>\n')
+        ET.ElementTree(sdf).write(f, encoding='unicode')
+        f.write('\n')
     
     return str(output_file)
 
@@ -8,6 +8,18 @@ from .road_extractor import extract_road_metadata
 from .osm_parser import parse_osm_file, get_way_coordinates
 
 
+# Tag values that make a way a park / green area
+_PARK_LEISURE = frozenset({'park', 'garden', 'recreation_ground'})
+_PARK_LANDUSE = frozenset({'grass', 'forest', 'meadow'})
+_PARK_RELATION_LEISURE = frozenset({'park', 'garden'})
+
+# Highway types that get sidewalks
+_SIDEWALK_HIGHWAY_TYPES = frozenset({'primary', 'secondary', 'tertiary', 'residential'})
+
+# Heights (~3m per floor) for the common building:levels values
+_LEVELS_HEIGHT = {str(levels): levels * 3.0 for levels in range(60)}
+
+
 def build_road_geometry(highway: Dict, enu_proj: ENUProjection, width: float = 5.0) -> Dict:
     """
     Build 3D geometry for a road from highway data.
@@ -20,14 +32,10 @@ def build_road_geometry(highway: Dict, enu_proj: ENUProjection, width: float = 5
     Returns:
         Dictionary with geometry data:
         - type: 'road'
-        - vertices: List of (x, y, z) tuples in ENU coordinates
+        - vertices: (N, 3) array of (x, y, z) rows in ENU coordinates
         - width: Road width
     """
-    vertices = []
-    
-    for lat, lon in highway['coordinates']:
-        e, n, u = enu_proj.project_to_enu(lat, lon, 0.0)
-        vertices.append((e, n, u))
+    vertices = enu_proj.project_to_enu_array(highway['coordinates'])
     
     return {
         'type': 'road',
@@ -51,14 +59,10 @@ def build_building_geometry(building: Dict, enu_proj: ENUProjection, height: flo
     Returns:
         Dictionary with geometry data:
         - type: 'building'
-        - base_vertices: List of (x, y, z) tuples for base polygon
+        - base_vertices: (N, 3) array of (x, y, z) rows for base polygon
         - height: Building height
     """
-    base_vertices = []
-    
-    for lat, lon in building['coordinates']:
-        e, n, u = enu_proj.project_to_enu(lat, lon, 0.0)
-        base_vertices.append((e, n, u))
+    base_vertices = enu_proj.project_to_enu_array(building['coordinates'])
     
     return {
         'type': 'building',
@@ -79,13 +83,9 @@ def build_park_geometry(park: Dict, enu_proj: ENUProjection) -> Dict:
     Returns:
         Dictionary with geometry data:
         - type: 'park'
-        - vertices: List of (x, y, z) tuples for park polygon
+        - vertices: (N, 3) array of (x, y, z) rows for park polygon
     """
-    vertices = []
-    
-    for lat, lon in park['coordinates']:
-        e, n, u = enu_proj.project_to_enu(lat, lon, 0.0)
-        vertices.append((e, n, u))
+    vertices = enu_proj.project_to_enu_array(park['coordinates'])
     
     return {
         'type': 'park',
@@ -106,14 +106,10 @@ def build_sidewalk_geometry(highway: Dict, enu_proj: ENUProjection, width: float
     Returns:
         Dictionary with geometry data:
         - type: 'sidewalk'
-        - vertices: List of (x, y, z) tuples
+        - vertices: (N, 3) array of (x, y, z) rows
         - width: Sidewalk width
     """
-    vertices = []
-    
-    for lat, lon in highway['coordinates']:
-        e, n, u = enu_proj.project_to_enu(lat, lon, 0.0)
-        vertices.append((e, n, u))
+    vertices = enu_proj.project_to_enu_array(highway['coordinates'])
     
     return {
         'type': 'sidewalk',
@@ -123,20 +119,26 @@ def build_sidewalk_geometry(highway: Dict, enu_proj: ENUProjection, width: float
     }
 
 
-def extract_buildings(osm_file_path: str) -> List[Dict]:
+def extract_buildings(osm_file_path: str,
+                      osm_data: Optional[Tuple[Dict, Dict, Dict]] = None) -> List[Dict]:
     """
     Extract buildings from OSM file (both ways and relations).
     
     Args:
         osm_file_path: Path to OSM file
+        osm_data: Optional (nodes, ways, relations) already parsed from the file
     
     Returns:
         List of building dictionaries
     """
-    nodes, ways, relations = parse_osm_file(osm_file_path)
+    if osm_data is None:
+        osm_data = parse_osm_file(osm_file_path)
+    nodes, ways, relations = osm_data
     
     buildings = []
-    processed_way_ids = set()  # Track ways already processed from relations
+    # Ways already processed from relations -> their coordinates; a way can be
+    # an outer member of several relations, so resolve its nodes only once
+    relation_way_coords = {}
     
     # First, process building relations (multipolygons)
     for rel_id, rel_data in relations.items():
@@ -146,11 +148,14 @@ def extract_buildings(osm_file_path: str) -> List[Dict]:
         if 'building' in tags or tags.get('type') == 'multipolygon':
             # Extract outer ways from relation
             for member in rel_data['members']:
-                if member['type'] == 'way' and member['role'] in ['outer', '']:
+                if member['type'] == 'way' and member['role'] in ('outer', ''):
                     way_id = member['ref']
                     if way_id in ways:
-                        processed_way_ids.add(way_id)
-                        coordinates = get_way_coordinates(way_id, {way_id: ways[way_id]}, nodes)
+                        if way_id in relation_way_coords:
+                            coordinates = relation_way_coords[way_id]
+                        else:
+                            coordinates = get_way_coordinates(way_id, ways, nodes)
+                            relation_way_coords[way_id] = coordinates
                         if coordinates and len(coordinates) >= 3:
                             # Merge tags from relation and way
                             way_tags = ways[way_id]['tags'].copy()
@@ -164,14 +169,15 @@ def extract_buildings(osm_file_path: str) -> List[Dict]:
     
     # Then, process standalone building ways (not in relations)
     for way_id, way_data in ways.items():
-        if way_id in processed_way_ids:
-            continue  # Already processed from relation
-        
         tags = way_data['tags']
         
-        # Check if it's a building
+        # Check if it's a building first: most ways are not, and this skips
+        # the processed-way lookup for them
         if 'building' in tags or tags.get('building:part') or tags.get('building:levels'):
-            coordinates = get_way_coordinates(way_id, {way_id: way_data}, nodes)
+            if way_id in relation_way_coords:
+                continue  # Already processed from relation
+            
+            coordinates = get_way_coordinates(way_id, ways, nodes)
             if coordinates and len(coordinates) >= 3:  # At least 3 points for a polygon
                 buildings.append({
                     'way_id': way_id,
@@ -182,17 +188,21 @@ def extract_buildings(osm_file_path: str) -> List[Dict]:
     return buildings
 
 
-def extract_parks(osm_file_path: str) -> List[Dict]:
+def extract_parks(osm_file_path: str,
+                  osm_data: Optional[Tuple[Dict, Dict, Dict]] = None) -> List[Dict]:
     """
     Extract parks and green areas from OSM file.
     
     Args:
         osm_file_path: Path to OSM file
+        osm_data: Optional (nodes, ways, relations) already parsed from the file
     
     Returns:
         List of park dictionaries
     """
-    nodes, ways, relations = parse_osm_file(osm_file_path)
+    if osm_data is None:
+        osm_data = parse_osm_file(osm_file_path)
+    nodes, ways, relations = osm_data
     
     parks = []
     
@@ -200,9 +210,8 @@ def extract_parks(osm_file_path: str) -> List[Dict]:
     for way_id, way_data in ways.items():
         tags = way_data['tags']
         
-        if tags.get('leisure') in ['park', 'garden', 'recreation_ground'] or \
-           tags.get('landuse') in ['grass', 'forest', 'meadow']:
-            coordinates = get_way_coordinates(way_id, {way_id: way_data}, nodes)
+        if tags.get('leisure') in _PARK_LEISURE or tags.get('landuse') in _PARK_LANDUSE:
+            coordinates = get_way_coordinates(way_id, ways, nodes)
             if coordinates and len(coordinates) >= 3:
                 parks.append({
                     'way_id': way_id,
@@ -214,14 +223,38 @@ def extract_parks(osm_file_path: str) -> List[Dict]:
     for rel_id, rel_data in relations.items():
         tags = rel_data['tags']
         
-        if tags.get('leisure') in ['park', 'garden'] or \
-           tags.get('landuse') in ['grass', 'forest', 'meadow']:
+        if tags.get('leisure') in _PARK_RELATION_LEISURE or tags.get('landuse') in _PARK_LANDUSE:
             # For now, skip relations (would need more complex handling)
             pass
     
     return parks
 
 
+def _building_height(tags: Dict[str, str], default: float = 10.0) -> float:
+    """
+    Get building height from tags if available.
+    
+    Args:
+        tags: Building tags
+        default: Height used when building:levels is missing or invalid
+    
+    Returns:
+        Building height in meters
+    """
+    levels = tags.get('building:levels')
+    if levels is None:
+        return default
+    
+    height = _LEVELS_HEIGHT.get(levels)
+    if height is not None:
+        return height
+    
+    try:
+        return int(levels) * 3.0  # ~3m per floor
+    except (ValueError, TypeError):
+        return default
+
+
 def build_all_geometry(osm_file_path: str, enu_proj: ENUProjection) -> Dict:
     """
     Build all geometry from OSM file using ENU projection.
@@ -237,47 +270,35 @@ def build_all_geometry(osm_file_path: str, enu_proj: ENUProjection) -> Dict:
         - parks: List of park geometries
         - sidewalks: List of sidewalk geometries
     """
+    # Parse the OSM file once for roads, buildings and parks
+    osm_data = parse_osm_file(osm_file_path)
+    
     # Extract road metadata
-    road_metadata = extract_road_metadata(osm_file_path)
+    road_metadata = extract_road_metadata(osm_file_path, osm_data)
     highways = road_metadata['highways']
     
     # Extract buildings
-    buildings = extract_buildings(osm_file_path)
+    buildings = extract_buildings(osm_file_path, osm_data)
     
     # Extract parks
-    parks = extract_parks(osm_file_path)
+    parks = extract_parks(osm_file_path, osm_data)
     
     # Build geometries
-    road_geometries = []
-    for highway in highways:
-        road_geom = build_road_geometry(highway, enu_proj)
-        road_geometries.append(road_geom)
-    
-    building_geometries = []
-    for building in buildings:
-        # Get height from tags if available
-        height = 10.0  # default
-        if 'building:levels' in building['tags']:
-            try:
-                levels = int(building['tags']['building:levels'])
-                height = levels * 3.0  # ~3m per floor
-            except (ValueError, TypeError):
-                pass
-        
-        building_geom = build_building_geometry(building, enu_proj, height)
-        building_geometries.append(building_geom)
-    
-    park_geometries = []
-    for park in parks:
-        park_geom = build_park_geometry(park, enu_proj)
-        park_geometries.append(park_geom)
-    
-    sidewalk_geometries = []
-    for highway in highways:
-        # Only add sidewalks to major roads
-        if highway['highway_type'] in ['primary', 'secondary', 'tertiary', 'residential']:
-            sidewalk_geom = build_sidewalk_geometry(highway, enu_proj)
-            sidewalk_geometries.append(sidewalk_geom)
+    road_geometries = [build_road_geometry(highway, enu_proj) for highway in highways]
+    
+    building_geometries = [
+        build_building_geometry(building, enu_proj, _building_height(building['tags']))
+        for building in buildings
+    ]
+    
+    park_geometries = [build_park_geometry(park, enu_proj) for park in parks]
+    
+    # Only add sidewalks to major roads
+    sidewalk_geometries = [
+        build_sidewalk_geometry(highway, enu_proj)
+        for highway in highways
+        if highway['highway_type'] in _SIDEWALK_HIGHWAY_TYPES
+    ]
     
     return {
         'roads': road_geometries,
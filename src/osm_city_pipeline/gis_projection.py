@@ -1,9 +1,51 @@
 """GIS projection utilities for OSM to ENU coordinate conversion."""
 
+import os
 import xml.etree.ElementTree as ET
 import math
-from typing import Tuple, Optional
-from pyproj import Transformer, CRS, Geod
+from functools import cached_property, lru_cache
+from typing import TYPE_CHECKING, List, Tuple, Optional
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from pyproj import Geod, Transformer
+
+
+@lru_cache(maxsize=16)
+def _enu_transformer(center_lat: float, center_lon: float) -> 'Transformer':
+    """
+    Build the WGS84 -> local ENU transformer for a projection center.
+    
+    Transformers are expensive to build, so the most recently used ones are
+    shared between projections with the same center.
+    
+    Args:
+        center_lat: Latitude of the projection center (degrees)
+        center_lon: Longitude of the projection center (degrees)
+    
+    Returns:
+        pyproj Transformer from (lon, lat) to (east, north) in meters
+    """
+    # pyproj loads PROJ on import, so defer it until a projection is needed
+    from pyproj import Transformer, CRS
+    
+    # Create WGS84 geodetic CRS
+    wgs84 = CRS.from_epsg(4326)
+    
+    # Create local ENU coordinate system using Transverse Mercator
+    # centered at the reference point with scale factor 1.0
+    # This gives us East-North coordinates in meters
+    enu_crs_string = (
+        f"+proj=tmerc +lat_0={center_lat} +lon_0={center_lon} "
+        f"+k=1 +x_0=0 +y_0=0 +ellps=WGS84 +units=m +no_defs"
+    )
+    enu_crs = CRS.from_string(enu_crs_string)
+    
+    # Create transformer from WGS84 to ENU
+    return Transformer.from_crs(
+        wgs84, enu_crs, always_xy=True
+    )
 
 
 class ENUProjection:
@@ -21,26 +63,14 @@ class ENUProjection:
         self.center_lat = center_lat
         self.center_lon = center_lon
         self.center_h = center_h
+        self.transformer = _enu_transformer(center_lat, center_lon)
+    
+    @cached_property
+    def geod(self) -> 'Geod':
+        """Geodetic calculator for accurate distance/azimuth calculations (created on first use)."""
+        from pyproj import Geod
         
-        # Create WGS84 geodetic CRS
-        wgs84 = CRS.from_epsg(4326)
-        
-        # Create local ENU coordinate system using Transverse Mercator
-        # centered at the reference point with scale factor 1.0
-        # This gives us East-North coordinates in meters
-        enu_crs_string = (
-            f"+proj=tmerc +lat_0={center_lat} +lon_0={center_lon} "
-            f"+k=1 +x_0=0 +y_0=0 +ellps=WGS84 +units=m +no_defs"
-        )
-        enu_crs = CRS.from_string(enu_crs_string)
-        
-        # Create transformer from WGS84 to ENU
-        self.transformer = Transformer.from_crs(
-            wgs84, enu_crs, always_xy=True
-        )
-        
-        # Create geodetic calculator for accurate distance/azimuth calculations
-        self.geod = Geod(ellps='WGS84')
+        return Geod(ellps='WGS84')
     
     def project_to_enu(self, lat: float, lon: float, h: float = 0.0) -> Tuple[float, float, float]:
         """
@@ -62,6 +92,32 @@ class ENUProjection:
         
         # Return (east, north, up)
         return (east, north, up)
+    
+    def project_to_enu_array(self, coordinates: List[Tuple[float, float]],
+                             h: float = 0.0) -> np.ndarray:
+        """
+        Project a sequence of WGS84 coordinates to ENU in one transformer call.
+        
+        Args:
+            coordinates: List of (lat, lon) tuples in degrees
+            h: Height in meters for every point (default: 0.0)
+        
+        Returns:
+            (N, 3) float64 array of (east, north, up) rows
+        """
+        points = np.empty((len(coordinates), 3), dtype=np.float64)
+        if not len(coordinates):
+            return points
+        
+        latlon = np.asarray(coordinates, dtype=np.float64)
+        
+        # pyproj transforms whole arrays in C
+        east, north = self.transformer.transform(latlon[:, 1], latlon[:, 0])
+        points[:, 0] = east
+        points[:, 1] = north
+        points[:, 2] = h - self.center_h
+        
+        return points
 
 
 def get_osm_bounds(osm_file_path: str) -> Optional[Tuple[float, float, float, float]]:
@@ -75,40 +131,94 @@ def get_osm_bounds(osm_file_path: str) -> Optional[Tuple[float, float, float, fl
         Tuple of (minlat, minlon, maxlat, maxlon) or None if not found
     """
     try:
-        tree = ET.parse(osm_file_path)
-        root = tree.getroot()
-        
-        # Look for bounds element
-        bounds = root.find('bounds')
-        if bounds is not None:
-            minlat = float(bounds.get('minlat'))
-            minlon = float(bounds.get('minlon'))
-            maxlat = float(bounds.get('maxlat'))
-            maxlon = float(bounds.get('maxlon'))
-            return (minlat, minlon, maxlat, maxlon)
+        # Running node extent, in case the file has no <bounds> element
+        minlat = minlon = math.inf
+        maxlat = maxlon = -math.inf
+        root = None
+        depth = 0
         
-        # If no bounds element, calculate from nodes
-        nodes = root.findall('node')
-        if not nodes:
-            return None
+        # Stream the file instead of building the whole tree: <bounds> comes
+        # before the nodes in OSM exports, so usually only the head is read
+        with open(osm_file_path, 'rb') as f:
+            for event, elem in ET.iterparse(f, events=('start', 'end')):
+                if event == 'start':
+                    depth += 1
+                    if depth == 1:
+                        root = elem
+                    elif depth == 2 and elem.tag == 'bounds':
+                        minlat = float(elem.get('minlat'))
+                        minlon = float(elem.get('minlon'))
+                        maxlat = float(elem.get('maxlat'))
+                        maxlon = float(elem.get('maxlon'))
+                        return (minlat, minlon, maxlat, maxlon)
+                    continue
+                
+                depth -= 1
+                if depth == 1:
+                    # If no bounds element, calculate from nodes
+                    if elem.tag == 'node':
+                        lat = elem.get('lat')
+                        if lat:
+                            lat = float(lat)
+                            if lat < minlat:
+                                minlat = lat
+                            if lat > maxlat:
+                                maxlat = lat
+                        lon = elem.get('lon')
+                        if lon:
+                            lon = float(lon)
+                            if lon < minlon:
+                                minlon = lon
+                            if lon > maxlon:
+                                maxlon = lon
+                    
+                    # Drop finished top-level elements so memory stays flat
+                    root.clear()
         
-        lats = [float(node.get('lat')) for node in nodes if node.get('lat')]
-        lons = [float(node.get('lon')) for node in nodes if node.get('lon')]
+        if minlat > maxlat or minlon > maxlon:
+            return None  # No node coordinates found
         
-        if not lats or not lons:
-            return None
-        
-        return (min(lats), min(lons), max(lats), max(lons))
+        return (minlat, minlon, maxlat, maxlon)
     
     except Exception as e:
         print(f"Error parsing OSM file: {e}")
         return None
 
 
+@lru_cache(maxsize=8)
+def _cached_osm_bounds(osm_file_path: str, mtime_ns: int, size: int) -> Optional[Tuple[float, float, float, float]]:
+    """get_osm_bounds memoized on the file's path, mtime (ns) and size."""
+    return get_osm_bounds(osm_file_path)
+
+
+def _osm_bounds_for(osm_file_path: str) -> Optional[Tuple[float, float, float, float]]:
+    """
+    Get the bounds of an OSM file, reusing earlier results for an unchanged file.
+    
+    Args:
+        osm_file_path: Path to the OSM XML file
+    
+    Returns:
+        Tuple of (minlat, minlon, maxlat, maxlon) or None if not found
+    """
+    try:
+        stat = os.stat(osm_file_path)
+    except OSError:
+        # Let get_osm_bounds report the error as before
+        return get_osm_bounds(osm_file_path)
+    
+    return _cached_osm_bounds(os.fspath(osm_file_path), stat.st_mtime_ns, stat.st_size)
+
+
 def create_enu_from_osm(osm_file_path: str, center_h: float = 0.0) -> Optional[ENUProjection]:
     """
     Create ENU projection centered at the bounding box center of an OSM file.
     
+    The file's bounds are cached per process while its mtime and size are
+    unchanged, and the projection's transformer is shared per center, so
+    repeated calls for the same file skip both the file read and the PROJ
+    pipeline setup.
+    
     Args:
         osm_file_path: Path to the OSM XML file
         center_h: Height of the projection center in meters (default: 0.0)
@@ -116,7 +226,7 @@ def create_enu_from_osm(osm_file_path: str, center_h: float = 0.0) -> Optional[E
     Returns:
         ENUProjection instance or None if bounds cannot be determined
     """
-    bounds = get_osm_bounds(osm_file_path)
+    bounds = _osm_bounds_for(osm_file_path)
     if bounds is None:
         return None
     
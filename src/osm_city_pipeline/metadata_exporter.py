@@ -2,15 +2,22 @@
 
 import json
 import yaml
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 import math
 
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from .gis_projection import create_enu_from_osm, ENUProjection
 from .road_extractor import extract_road_metadata
 
 
-def convert_centerline_to_enu(centerline: Dict, enu_proj: ENUProjection) -> List[Tuple[float, float, float]]:
+def convert_centerline_to_enu(centerline: Dict, enu_proj: ENUProjection) -> np.ndarray:
     """
     Convert lane centerline from WGS84 to ENU coordinates.
     
@@ -19,36 +26,25 @@ def convert_centerline_to_enu(centerline: Dict, enu_proj: ENUProjection) -> List
         enu_proj: ENU projection instance
     
     Returns:
-        List of (east, north, up) tuples in ENU coordinates
+        (N, 3) float64 array of (east, north, up) rows in ENU coordinates
     """
-    enu_centerline = []
-    
-    for lat, lon in centerline['centerline']:
-        e, n, u = enu_proj.project_to_enu(lat, lon, 0.0)
-        enu_centerline.append((e, n, u))
-    
-    return enu_centerline
+    # One transformer call for the whole centerline
+    return enu_proj.project_to_enu_array(centerline['centerline'], 0.0)
 
 
-def export_roads_json(osm_file_path: str, output_path: str) -> Dict:
+def _roads_data(lane_centerlines: List[Dict], enu_centerlines: List[np.ndarray],
+                enu_proj: ENUProjection) -> Dict:
     """
-    Export roads.json with lane centerlines in ENU coordinates.
+    Build the roads.json data from already projected lane centerlines.
     
     Args:
-        osm_file_path: Path to OSM file
-        output_path: Path to output JSON file
+        lane_centerlines: List of lane centerline dictionaries
+        enu_centerlines: convert_centerline_to_enu result for each lane centerline
+        enu_proj: ENU projection instance
     
     Returns:
-        Dictionary with exported roads data
+        Dictionary with projection center and roads
     """
-    # Create ENU projection
-    enu_proj = create_enu_from_osm(osm_file_path)
-    
-    # Extract road metadata
-    road_metadata = extract_road_metadata(osm_file_path)
-    lane_centerlines = road_metadata['lane_centerlines']
-    
-    # Convert centerlines to ENU
     roads_data = {
         'projection_center': {
             'latitude': enu_proj.center_lat,
@@ -58,9 +54,7 @@ def export_roads_json(osm_file_path: str, output_path: str) -> Dict:
         'roads': []
     }
     
-    for centerline in lane_centerlines:
-        enu_centerline = convert_centerline_to_enu(centerline, enu_proj)
-        
+    for centerline, enu_centerline in zip(lane_centerlines, enu_centerlines):
         road_data = {
             'way_id': centerline['way_id'],
             'name': centerline['name'],
@@ -68,24 +62,80 @@ def export_roads_json(osm_file_path: str, output_path: str) -> Dict:
             'lanes': centerline['lanes'],
             'centerline_enu': [
                 {'east': e, 'north': n, 'up': u}
-                for e, n, u in enu_centerline
+                for e, n, u in enu_centerline.tolist()
             ]
         }
         
         roads_data['roads'].append(road_data)
     
-    # Write to file
+    return roads_data
+
+
+def extract_roads_data(osm_file_path: str) -> Dict:
+    """
+    Build the roads.json data (lane centerlines in ENU coordinates) in memory.
+    
+    Args:
+        osm_file_path: Path to OSM file
+    
+    Returns:
+        Dictionary with projection center and roads
+    """
+    # Create ENU projection
+    enu_proj = create_enu_from_osm(osm_file_path)
+    
+    # Extract road metadata
+    road_metadata = extract_road_metadata(osm_file_path)
+    lane_centerlines = road_metadata['lane_centerlines']
+    
+    # Convert centerlines to ENU
+    enu_centerlines = [convert_centerline_to_enu(centerline, enu_proj)
+                       for centerline in lane_centerlines]
+    
+    return _roads_data(lane_centerlines, enu_centerlines, enu_proj)
+
+
+def _write_roads_json(roads_data: Dict, output_path: str) -> None:
+    """
+    Write roads data to a JSON file.
+    
+    Args:
+        roads_data: Dictionary from extract_roads_data
+        output_path: Path to output JSON file
+    """
     output_file = Path(output_path)
     output_file.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(roads_data, f, indent=2, ensure_ascii=False)
+    if orjson is not None:
+        # orjson serializes in C and writes UTF-8 bytes directly
+        output_file.write_bytes(orjson.dumps(roads_data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(roads_data, f, indent=2, ensure_ascii=False)
+
+
+def export_roads_json(osm_file_path: str, output_path: str) -> Dict:
+    """
+    Export roads.json with lane centerlines in ENU coordinates.
+    
+    Args:
+        osm_file_path: Path to OSM file
+        output_path: Path to output JSON file
+    
+    Returns:
+        Dictionary with exported roads data
+    """
+    roads_data = extract_roads_data(osm_file_path)
+    
+    # Write to file
+    _write_roads_json(roads_data, output_path)
     
     return roads_data
 
 
 def generate_spawn_points(lane_centerlines: List[Dict], enu_proj: ENUProjection, 
-                          spacing: float = 10.0) -> List[Dict]:
+                          spacing: float = 10.0,
+                          enu_centerlines: Optional[List[np.ndarray]] = None) -> List[Dict]:
     """
     Generate spawn points along lane centerlines.
     Spawn points are placed exactly on centerline points or interpolated between them.
@@ -95,6 +145,8 @@ def generate_spawn_points(lane_centerlines: List[Dict], enu_proj: ENUProjection,
         lane_centerlines: List of lane centerline dictionaries
         enu_proj: ENU projection instance
         spacing: Spacing between spawn points in meters (default: 10.0)
+        enu_centerlines: Optional convert_centerline_to_enu result for each lane
+            centerline, to reuse a projection already done by the caller
     
     Returns:
         List of spawn point dictionaries with ENU coordinates
@@ -102,20 +154,29 @@ def generate_spawn_points(lane_centerlines: List[Dict], enu_proj: ENUProjection,
     spawn_points = []
     spawn_id = 0
     
-    for centerline in lane_centerlines:
-        # Convert centerline to ENU
-        enu_centerline = convert_centerline_to_enu(centerline, enu_proj)
+    for i, centerline in enumerate(lane_centerlines):
+        # Convert centerline to ENU (unless the caller already did)
+        if enu_centerlines is not None:
+            points = enu_centerlines[i]
+        else:
+            points = convert_centerline_to_enu(centerline, enu_proj)
         
-        if len(enu_centerline) < 2:
+        if len(points) < 2:
             continue
         
-        # Generate spawn points along the centerline using accumulated distance
-        accumulated_distance = 0.0
-        next_spawn_distance = 0.0
+        # First and last two points as Python floats for the scalar code below
+        first_points = points[:2].tolist()
+        last_points = points[-2:].tolist()
+        
+        # Segment lengths and cumulative arc length along the centerline
+        deltas = np.diff(points, axis=0)
+        segment_lengths = np.sqrt(deltas[:, 0] * deltas[:, 0] + deltas[:, 1] * deltas[:, 1])
+        segment_ends = np.cumsum(segment_lengths)
+        segment_starts = np.concatenate(([0.0], segment_ends[:-1]))
         
         # Always start with first point
-        p1 = enu_centerline[0]
-        p2 = enu_centerline[1] if len(enu_centerline) > 1 else p1
+        p1 = first_points[0]
+        p2 = first_points[1]
         dx = p2[0] - p1[0]
         dy = p2[1] - p1[1]
         yaw = math.atan2(dy, dx) if (dx != 0 or dy != 0) else 0.0
@@ -137,34 +198,25 @@ def generate_spawn_points(lane_centerlines: List[Dict], enu_proj: ENUProjection,
         }
         spawn_points.append(spawn_point)
         spawn_id += 1
-        next_spawn_distance = spacing
         
-        # Process segments
-        for i in range(len(enu_centerline) - 1):
-            p1 = enu_centerline[i]
-            p2 = enu_centerline[i + 1]
-            
-            # Calculate segment length
-            dx = p2[0] - p1[0]
-            dy = p2[1] - p1[1]
-            segment_length = math.sqrt(dx*dx + dy*dy)
+        # Very short segments (< 1cm) are skipped but still count towards distance
+        usable = np.flatnonzero(segment_lengths >= 0.01)
+        
+        if len(usable) > 0:
+            usable_ends = segment_ends[usable]
             
-            if segment_length < 0.01:  # Skip very short segments
-                accumulated_distance += segment_length
-                continue
+            # Spawn distances at spacing intervals up to the end of the last usable segment
+            count = int(usable_ends[-1] // spacing) + 2
+            distances = np.cumsum(np.full(count, spacing))
+            distances = distances[distances < usable_ends[-1]]
             
-            segment_start_distance = accumulated_distance
-            segment_end_distance = accumulated_distance + segment_length
+            # Each distance is interpolated on the first usable segment ending past it
+            segments = usable[np.searchsorted(usable_ends, distances, side='right')]
+            t = (distances - segment_starts[segments]) / segment_lengths[segments]
+            positions = points[segments] + t[:, None] * deltas[segments]
+            yaws = np.arctan2(deltas[segments, 1], deltas[segments, 0])
             
-            # Add spawn points at spacing intervals along this segment
-            while next_spawn_distance < segment_end_distance:
-                # Interpolate position along segment
-                t = (next_spawn_distance - segment_start_distance) / segment_length
-                e = p1[0] + t * dx
-                n = p1[1] + t * dy
-                u = p1[2] + t * (p2[2] - p1[2])
-                yaw = math.atan2(dy, dx)
-                
+            for (e, n, u), yaw in zip(positions.tolist(), yaws.tolist()):
                 spawn_point = {
                     'id': spawn_id,
                     'name': f'spawn_point_{spawn_id}',
@@ -183,12 +235,9 @@ def generate_spawn_points(lane_centerlines: List[Dict], enu_proj: ENUProjection,
                 
                 spawn_points.append(spawn_point)
                 spawn_id += 1
-                next_spawn_distance += spacing
-            
-            accumulated_distance = segment_end_distance
         
         # Always add the last point of the centerline
-        last_point = enu_centerline[-1]
+        last_point = last_points[-1]
         last_e = round(last_point[0], 6)
         last_n = round(last_point[1], 6)
         last_u = round(last_point[2], 6)
@@ -197,14 +246,10 @@ def generate_spawn_points(lane_centerlines: List[Dict], enu_proj: ENUProjection,
         if not spawn_points or (spawn_points[-1]['position']['east'] != last_e or 
                                 spawn_points[-1]['position']['north'] != last_n):
             # Calculate yaw from last segment
-            if len(enu_centerline) >= 2:
-                p1 = enu_centerline[-2]
-                p2 = enu_centerline[-1]
-                dx = p2[0] - p1[0]
-                dy = p2[1] - p1[1]
-                yaw = math.atan2(dy, dx) if (dx != 0 or dy != 0) else 0.0
-            else:
-                yaw = 0.0
+            p1, p2 = last_points
+            dx = p2[0] - p1[0]
+            dy = p2[1] - p1[1]
+            yaw = math.atan2(dy, dx) if (dx != 0 or dy != 0) else 0.0
             
             spawn_point = {
                 'id': spawn_id,
@@ -250,6 +295,22 @@ def export_spawn_points_yaml(osm_file_path: str, output_path: str, spacing: floa
     # Generate spawn points
     spawn_points = generate_spawn_points(lane_centerlines, enu_proj, spacing)
     
+    # Write to file
+    _write_spawn_points_yaml(spawn_points, enu_proj, output_path)
+    
+    return spawn_points
+
+
+def _write_spawn_points_yaml(spawn_points: List[Dict], enu_proj: ENUProjection,
+                             output_path: str) -> None:
+    """
+    Write spawn points and the projection center to a YAML file.
+    
+    Args:
+        spawn_points: List of spawn point dictionaries
+        enu_proj: ENU projection instance
+        output_path: Path to output YAML file
+    """
     # Create YAML structure
     yaml_data = {
         'spawn_points': spawn_points,
@@ -267,8 +328,6 @@ def export_spawn_points_yaml(osm_file_path: str, output_path: str, spacing: floa
     
     with open(output_file, 'w', encoding='utf-8') as f:
         yaml.dump(yaml_data, f, default_flow_style=False, sort_keys=False, allow_unicode=True)
-    
-    return spawn_points
 
 
 def export_all_metadata(osm_file_path: str, roads_json_path: str, spawn_points_yaml_path: str,
@@ -285,11 +344,22 @@ def export_all_metadata(osm_file_path: str, roads_json_path: str, spawn_points_y
     Returns:
         Tuple of (roads_data, spawn_points)
     """
+    # Create ENU projection and extract road metadata once for both files
+    enu_proj = create_enu_from_osm(osm_file_path)
+    road_metadata = extract_road_metadata(osm_file_path)
+    lane_centerlines = road_metadata['lane_centerlines']
+    
+    # Project each centerline once; roads.json and the spawn points share it
+    enu_centerlines = [convert_centerline_to_enu(centerline, enu_proj)
+                       for centerline in lane_centerlines]
+    
     # Export roads.json
-    roads_data = export_roads_json(osm_file_path, roads_json_path)
+    roads_data = _roads_data(lane_centerlines, enu_centerlines, enu_proj)
+    _write_roads_json(roads_data, roads_json_path)
     
     # Export spawn_points.yaml
-    spawn_points = export_spawn_points_yaml(osm_file_path, spawn_points_yaml_path, spawn_spacing)
+    spawn_points = generate_spawn_points(lane_centerlines, enu_proj, spawn_spacing, enu_centerlines)
+    _write_spawn_points_yaml(spawn_points, enu_proj, spawn_points_yaml_path)
     
     return roads_data, spawn_points
 
@@ -1,5 +1,7 @@
 """OSM file parser using osmium."""
 
+import os
+from functools import lru_cache
 import osmium
 from typing import Dict, List, Optional, Tuple
 from collections import defaultdict
@@ -19,12 +21,10 @@ class OSMHandler(osmium.SimpleHandler):
         """Process a node."""
         self.nodes[n.id] = (n.location.lat, n.location.lon)
         
-        # Store node tags if any
-        if len(list(n.tags)) > 0:
-            tags = {}
-            for tag in n.tags:
-                tags[tag.k] = tag.v
-            self.node_tags[n.id] = tags
+        # Store node tags if any (most nodes are untagged, so check the
+        # tag count without materialising the tag list)
+        if len(n.tags) > 0:
+            self.node_tags[n.id] = {tag.k: tag.v for tag in n.tags}
     
     def way(self, w):
         """Process a way."""
@@ -34,13 +34,9 @@ class OSMHandler(osmium.SimpleHandler):
         if len(node_ids) < 2:
             return
         
-        tags = {}
-        for tag in w.tags:
-            tags[tag.k] = tag.v
-        
         self.ways[w.id] = {
             'nodes': node_ids,
-            'tags': tags
+            'tags': {tag.k: tag.v for tag in w.tags}
         }
     
     def relation(self, r):
@@ -58,19 +54,15 @@ class OSMHandler(osmium.SimpleHandler):
                 'role': m.role
             })
         
-        tags = {}
-        for tag in r.tags:
-            tags[tag.k] = tag.v
-        
         self.relations[r.id] = {
             'members': members,
-            'tags': tags
+            'tags': {tag.k: tag.v for tag in r.tags}
         }
 
 
-def parse_osm_file(osm_file_path: str) -> Tuple[Dict, Dict, Dict]:
+def _parse_osm_file(osm_file_path: str) -> Tuple[Dict, Dict, Dict]:
     """
-    Parse an OSM file and return nodes, ways, and relations.
+    Parse an OSM file with osmium (uncached).
     
     Args:
         osm_file_path: Path to the OSM file
@@ -88,6 +80,36 @@ def parse_osm_file(osm_file_path: str) -> Tuple[Dict, Dict, Dict]:
     return handler.nodes, handler.ways, handler.relations
 
 
+@lru_cache(maxsize=2)
+def _parse_osm_file_cached(osm_file_path: str, mtime_ns: int, size: int) -> Tuple[Dict, Dict, Dict]:
+    """Parse an OSM file, memoized on its path, mtime (ns) and size."""
+    return _parse_osm_file(osm_file_path)
+
+
+def parse_osm_file(osm_file_path: str) -> Tuple[Dict, Dict, Dict]:
+    """
+    Parse an OSM file and return nodes, ways, and relations.
+    
+    Results are cached per process while the file's mtime and size are
+    unchanged, so extracting roads, buildings and parks from the same file
+    parses it once. The returned dictionaries are shared between callers and
+    must not be modified.
+    
+    Args:
+        osm_file_path: Path to the OSM file
+    
+    Returns:
+        Tuple of (nodes_dict, ways_dict, relations_dict)
+    """
+    try:
+        stat = os.stat(osm_file_path)
+    except OSError:
+        # Let osmium report the missing/unreadable file as before
+        return _parse_osm_file(osm_file_path)
+    
+    return _parse_osm_file_cached(os.fspath(osm_file_path), stat.st_mtime_ns, stat.st_size)
+
+
 def get_node_coordinates(node_id: int, nodes: Dict) -> Optional[Tuple[float, float]]:
     """
     Get coordinates for a node ID.
@@ -117,13 +139,8 @@ def get_way_coordinates(way_id: int, ways: Dict, nodes: Dict) -> Optional[List[T
     if way_id not in ways:
         return None
     
-    way = ways[way_id]
-    coordinates = []
-    
-    for node_id in way['nodes']:
-        coords = get_node_coordinates(node_id, nodes)
-        if coords is not None:
-            coordinates.append(coords)
+    get_node = nodes.get
+    coordinates = [coords for coords in map(get_node, ways[way_id]['nodes']) if coords is not None]
     
     return coordinates if len(coordinates) > 0 else None
 
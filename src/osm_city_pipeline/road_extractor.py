@@ -1,10 +1,16 @@
 """Extract roads, highways, intersections, and lane centerlines from OSM data."""
 
 import json
+import math
 from typing import Dict, List, Optional, Tuple
 from collections import defaultdict
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from .osm_parser import parse_osm_file, get_way_coordinates
 
 
@@ -36,12 +42,14 @@ def is_highway(way_tags: Dict[str, str]) -> bool:
     return highway in HIGHWAY_TYPES
 
 
-def extract_highways(osm_file_path: str) -> List[Dict]:
+def extract_highways(osm_file_path: str,
+                     osm_data: Optional[Tuple[Dict, Dict, Dict]] = None) -> List[Dict]:
     """
     Extract all highways from an OSM file.
     
     Args:
         osm_file_path: Path to the OSM file
+        osm_data: Optional (nodes, ways, relations) already parsed from the file
     
     Returns:
         List of highway dictionaries with keys:
@@ -51,7 +59,9 @@ def extract_highways(osm_file_path: str) -> List[Dict]:
         - coordinates: List of (lat, lon) tuples
         - tags: All way tags
     """
-    nodes, ways, relations = parse_osm_file(osm_file_path)
+    if osm_data is None:
+        osm_data = parse_osm_file(osm_file_path)
+    nodes, ways, relations = osm_data
     
     highways = []
     
@@ -62,7 +72,7 @@ def extract_highways(osm_file_path: str) -> List[Dict]:
             continue
         
         # Get coordinates for this way
-        coordinates = get_way_coordinates(way_id, {way_id: way_data}, nodes)
+        coordinates = get_way_coordinates(way_id, ways, nodes)
         if coordinates is None or len(coordinates) < 2:
             continue
         
@@ -93,6 +103,14 @@ def find_intersections(highways: List[Dict], nodes: Dict) -> List[Dict]:
         - coordinates: (lat, lon) tuple
         - connected_ways: List of way IDs connected at this intersection
     """
+    # Bucket nodes on a grid with the matching tolerance as cell size, so a
+    # coordinate only needs comparing against nodes in the 3x3 neighbouring cells
+    tolerance = 0.00001
+    node_grid = defaultdict(list)
+    for order, (node_id, (lat, lon)) in enumerate(nodes.items()):
+        cell = (math.floor(lat / tolerance), math.floor(lon / tolerance))
+        node_grid[cell].append((order, node_id, lat, lon))
+    
     # Count how many ways pass through each node
     node_way_count = defaultdict(list)
     
@@ -101,23 +119,35 @@ def find_intersections(highways: List[Dict], nodes: Dict) -> List[Dict]:
         coordinates = highway['coordinates']
         
         # Find node IDs for coordinates (approximate matching)
-        for coord in coordinates:
-            # Find the closest node to this coordinate
-            for node_id, (lat, lon) in nodes.items():
-                if abs(lat - coord[0]) < 0.00001 and abs(lon - coord[1]) < 0.00001:
-                    node_way_count[node_id].append(way_id)
-                    break
+        for coord_lat, coord_lon in coordinates:
+            cell_lat = math.floor(coord_lat / tolerance)
+            cell_lon = math.floor(coord_lon / tolerance)
+            
+            # Find the first node (in file order) close to this coordinate
+            match = None
+            for d_lat in (-1, 0, 1):
+                for d_lon in (-1, 0, 1):
+                    for candidate in node_grid.get((cell_lat + d_lat, cell_lon + d_lon), ()):
+                        order, node_id, lat, lon = candidate
+                        if abs(lat - coord_lat) < tolerance and abs(lon - coord_lon) < tolerance:
+                            if match is None or order < match[0]:
+                                match = candidate
+                            break
+            
+            if match is not None:
+                node_way_count[match[1]].append(way_id)
     
     # Intersections are nodes where 2+ ways meet
     intersections = []
     for node_id, way_ids in node_way_count.items():
-        if len(set(way_ids)) >= 2:  # At least 2 different ways
+        unique_way_ids = set(way_ids)
+        if len(unique_way_ids) >= 2:  # At least 2 different ways
             coords = nodes.get(node_id)
             if coords:
                 intersections.append({
                     'node_id': node_id,
                     'coordinates': coords,
-                    'connected_ways': list(set(way_ids))
+                    'connected_ways': list(unique_way_ids)
                 })
     
     return intersections
@@ -164,12 +194,14 @@ def extract_lane_centerlines(highways: List[Dict]) -> List[Dict]:
     return centerlines
 
 
-def extract_road_metadata(osm_file_path: str) -> Dict:
+def extract_road_metadata(osm_file_path: str,
+                          osm_data: Optional[Tuple[Dict, Dict, Dict]] = None) -> Dict:
     """
     Extract all road-related metadata from an OSM file.
     
     Args:
         osm_file_path: Path to the OSM file
+        osm_data: Optional (nodes, ways, relations) already parsed from the file
     
     Returns:
         Dictionary containing:
@@ -178,11 +210,13 @@ def extract_road_metadata(osm_file_path: str) -> Dict:
         - lane_centerlines: List of lane centerline dictionaries
         - summary: Summary statistics
     """
-    # Parse OSM file
-    nodes, ways, relations = parse_osm_file(osm_file_path)
+    # Parse OSM file (once; the highways are extracted from the same data)
+    if osm_data is None:
+        osm_data = parse_osm_file(osm_file_path)
+    nodes, ways, relations = osm_data
     
     # Extract highways
-    highways = extract_highways(osm_file_path)
+    highways = extract_highways(osm_file_path, osm_data)
     
     # Find intersections
     intersections = find_intersections(highways, nodes)
@@ -224,8 +258,12 @@ def save_road_metadata(metadata: Dict, output_path: str) -> None:
     output_file = Path(output_path)
     output_file.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(metadata, f, indent=2, ensure_ascii=False)
+    if orjson is not None:
+        # orjson serializes in C and writes UTF-8 bytes directly
+        output_file.write_bytes(orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, indent=2, ensure_ascii=False)
 
 
 def extract_and_save_road_metadata(osm_file_path: str, output_path: str) -> Dict:
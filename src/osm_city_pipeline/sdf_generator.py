@@ -2,13 +2,38 @@
 
 from typing import Dict, List, Tuple
 from xml.etree import ElementTree as ET
-from xml.dom import minidom
 import math
 
+import numpy as np
+
 from .geometry_builder import build_all_geometry
 from .gis_projection import create_enu_from_osm
 
 
+def _segment_frames(vertices: np.ndarray) -> List[Tuple[int, List[float], float, float]]:
+    """
+    Compute center, length and heading of all polyline segments at once.
+    
+    Args:
+        vertices: (N, 3) array (or list) of (x, y, z) points
+    
+    Returns:
+        List of (segment_index, [center_x, center_y, center_z], length, angle)
+        for segments longer than 0.1m
+    """
+    points = np.asarray(vertices, dtype=np.float64)
+    deltas = np.diff(points, axis=0)
+    centers = (points[:-1] + points[1:]) / 2.0
+    lengths = np.sqrt(deltas[:, 0] * deltas[:, 0] + deltas[:, 1] * deltas[:, 1])
+    
+    # Only keep segments that are meaningful
+    keep = np.flatnonzero(lengths > 0.1)
+    
+    # math.atan2 keeps headings bit-identical to the scalar implementation
+    angles = [math.atan2(dy, dx) for dx, dy in deltas[keep, :2].tolist()]
+    return list(zip(keep.tolist(), centers[keep].tolist(), lengths[keep].tolist(), angles))
+
+
 def create_sdf_world(geometries: Dict, world_name: str = "osm_city") -> str:
     """
     Create SDF world XML from geometry data.
@@ -82,49 +107,39 @@ def create_sdf_world(geometries: Dict, world_name: str = "osm_city") -> str:
         
         # Create road mesh from vertices
         vertices = road['vertices']
+        road_width = road['width']
         if len(vertices) >= 2:
             # Create a simple road segment
-            for j in range(len(vertices) - 1):
-                v1 = vertices[j]
-                v2 = vertices[j + 1]
-                
-                # Calculate road segment center and orientation
-                center_x = (v1[0] + v2[0]) / 2.0
-                center_y = (v1[1] + v2[1]) / 2.0
-                center_z = (v1[2] + v2[2]) / 2.0
+            for j, (center_x, center_y, center_z), length, angle in _segment_frames(vertices):
+                # Visual and collision share the same pose and box size
+                pose_text = f'{center_x} {center_y} {center_z} 0 0 {angle}'
+                size_text = f'{length} {road_width} 0.1'
                 
-                # Calculate length and angle
-                dx = v2[0] - v1[0]
-                dy = v2[1] - v1[1]
-                length = math.sqrt(dx*dx + dy*dy)
-                angle = math.atan2(dy, dx)
+                # Create visual
+                visual = ET.SubElement(link, 'visual', name=f'visual_{j}')
+                pose_vis = ET.SubElement(visual, 'pose')
+                pose_vis.text = pose_text
+                geometry_vis = ET.SubElement(visual, 'geometry')
+                box_vis = ET.SubElement(geometry_vis, 'box')
+                size_vis = ET.SubElement(box_vis, 'size')
+                size_vis.text = size_text
+                material_vis = ET.SubElement(visual, 'material')
+                # Use dark grey/black for roads to distinguish from ground
+                ambient = ET.SubElement(material_vis, 'ambient')
+                ambient.text = '0.15 0.15 0.15 1'  # Dark grey
+                diffuse = ET.SubElement(material_vis, 'diffuse')
+                diffuse.text = '0.2 0.2 0.2 1'  # Dark grey
+                specular = ET.SubElement(material_vis, 'specular')
+                specular.text = '0.1 0.1 0.1 1'
                 
-                if length > 0.1:  # Only create if segment is meaningful
-                    # Create visual
-                    visual = ET.SubElement(link, 'visual', name=f'visual_{j}')
-                    pose_vis = ET.SubElement(visual, 'pose')
-                    pose_vis.text = f'{center_x} {center_y} {center_z} 0 0 {angle}'
-                    geometry_vis = ET.SubElement(visual, 'geometry')
-                    box_vis = ET.SubElement(geometry_vis, 'box')
-                    size_vis = ET.SubElement(box_vis, 'size')
-                    size_vis.text = f'{length} {road["width"]} 0.1'
-                    material_vis = ET.SubElement(visual, 'material')
-                    # Use dark grey/black for roads to distinguish from ground
-                    ambient = ET.SubElement(material_vis, 'ambient')
-                    ambient.text = '0.15 0.15 0.15 1'  # Dark grey
-                    diffuse = ET.SubElement(material_vis, 'diffuse')
-                    diffuse.text = '0.2 0.2 0.2 1'  # Dark grey
-                    specular = ET.SubElement(material_vis, 'specular')
-                    specular.text = '0.1 0.1 0.1 1'
-                    
-                    # Create collision
-                    collision = ET.SubElement(link, 'collision', name=f'collision_{j}')
-                    pose_coll = ET.SubElement(collision, 'pose')
-                    pose_coll.text = f'{center_x} {center_y} {center_z} 0 0 {angle}'
-                    geometry_coll = ET.SubElement(collision, 'geometry')
-                    box_coll = ET.SubElement(geometry_coll, 'box')
-                    size_coll = ET.SubElement(box_coll, 'size')
-                    size_coll.text = f'{length} {road["width"]} 0.1'
+                # Create collision
+                collision = ET.SubElement(link, 'collision', name=f'collision_{j}')
+                pose_coll = ET.SubElement(collision, 'pose')
+                pose_coll.text = pose_text
+                geometry_coll = ET.SubElement(collision, 'geometry')
+                box_coll = ET.SubElement(geometry_coll, 'box')
+                size_coll = ET.SubElement(box_coll, 'size')
+                size_coll.text = size_text
     
     # Add buildings (extruded)
     for i, building in enumerate(geometries.get('buildings', [])):
@@ -136,16 +151,14 @@ def create_sdf_world(geometries: Dict, world_name: str = "osm_city") -> str:
         base_vertices = building['base_vertices']
         if len(base_vertices) >= 3:
             # Calculate building center
-            center_x = sum(v[0] for v in base_vertices) / len(base_vertices)
-            center_y = sum(v[1] for v in base_vertices) / len(base_vertices)
+            footprint = np.asarray(base_vertices, dtype=np.float64)[:, :2]
+            center_x, center_y = footprint.mean(axis=0).tolist()
             center_z = building['height'] / 2.0
             
             # Create building as a box (simplified - could use mesh for complex shapes)
             # For now, use bounding box
-            min_x = min(v[0] for v in base_vertices)
-            max_x = max(v[0] for v in base_vertices)
-            min_y = min(v[1] for v in base_vertices)
-            max_y = max(v[1] for v in base_vertices)
+            min_x, min_y = footprint.min(axis=0).tolist()
+            max_x, max_y = footprint.max(axis=0).tolist()
             
             width = max_x - min_x
             depth = max_y - min_y
@@ -174,11 +187,14 @@ def create_sdf_world(geometries: Dict, world_name: str = "osm_city") -> str:
                 # Walls (light grey) - four sides
                 wall_height = height
                 wall_thickness = 0.1
+                half_width = width / 2
+                half_depth = depth / 2
+                wall_z = wall_height / 2
                 
                 # Front wall (positive Y)
                 front_wall = ET.SubElement(link, 'visual', name='front_wall')
                 front_pose = ET.SubElement(front_wall, 'pose')
-                front_pose.text = f'{center_x} {center_y + depth/2} {wall_height/2} 0 0 0'
+                front_pose.text = f'{center_x} {center_y + half_depth} {wall_z} 0 0 0'
                 front_geometry = ET.SubElement(front_wall, 'geometry')
                 front_box = ET.SubElement(front_geometry, 'box')
                 front_size = ET.SubElement(front_box, 'size')
@@ -192,7 +208,7 @@ def create_sdf_world(geometries: Dict, world_name: str = "osm_city") -> str:
                 # Back wall (negative Y)
                 back_wall = ET.SubElement(link, 'visual', name='back_wall')
                 back_pose = ET.SubElement(back_wall, 'pose')
-                back_pose.text = f'{center_x} {center_y - depth/2} {wall_height/2} 0 0 0'
+                back_pose.text = f'{center_x} {center_y - half_depth} {wall_z} 0 0 0'
                 back_geometry = ET.SubElement(back_wall, 'geometry')
                 back_box = ET.SubElement(back_geometry, 'box')
                 back_size = ET.SubElement(back_box, 'size')
@@ -206,7 +222,7 @@ def create_sdf_world(geometries: Dict, world_name: str = "osm_city") -> str:
                 # Left wall (negative X)
                 left_wall = ET.SubElement(link, 'visual', name='left_wall')
                 left_pose = ET.SubElement(left_wall, 'pose')
-                left_pose.text = f'{center_x - width/2} {center_y} {wall_height/2} 0 0 0'
+                left_pose.text = f'{center_x - half_width} {center_y} {wall_z} 0 0 0'
                 left_geometry = ET.SubElement(left_wall, 'geometry')
                 left_box = ET.SubElement(left_geometry, 'box')
                 left_size = ET.SubElement(left_box, 'size')
@@ -220,7 +236,7 @@ def create_sdf_world(geometries: Dict, world_name: str = "osm_city") -> str:
                 # Right wall (positive X)
                 right_wall = ET.SubElement(link, 'visual', name='right_wall')
                 right_pose = ET.SubElement(right_wall, 'pose')
-                right_pose.text = f'{center_x + width/2} {center_y} {wall_height/2} 0 0 0'
+                right_pose.text = f'{center_x + half_width} {center_y} {wall_z} 0 0 0'
                 right_geometry = ET.SubElement(right_wall, 'geometry')
                 right_box = ET.SubElement(right_geometry, 'box')
                 right_size = ET.SubElement(right_box, 'size')
@@ -250,14 +266,12 @@ def create_sdf_world(geometries: Dict, world_name: str = "osm_city") -> str:
         vertices = park['vertices']
         if len(vertices) >= 3:
             # Calculate park center and bounding box
-            center_x = sum(v[0] for v in vertices) / len(vertices)
-            center_y = sum(v[1] for v in vertices) / len(vertices)
+            outline = np.asarray(vertices, dtype=np.float64)[:, :2]
+            center_x, center_y = outline.mean(axis=0).tolist()
             center_z = 0.05  # Slightly above ground
             
-            min_x = min(v[0] for v in vertices)
-            max_x = max(v[0] for v in vertices)
-            min_y = min(v[1] for v in vertices)
-            max_y = max(v[1] for v in vertices)
+            min_x, min_y = outline.min(axis=0).tolist()
+            max_x, max_y = outline.max(axis=0).tolist()
             
             width = max_x - min_x
             depth = max_y - min_y
@@ -288,38 +302,27 @@ def create_sdf_world(geometries: Dict, world_name: str = "osm_city") -> str:
         link = ET.SubElement(sidewalk_model, 'link', name='link')
         
         vertices = sidewalk['vertices']
+        sidewalk_width = sidewalk['width']
         if len(vertices) >= 2:
             # Create sidewalk segments similar to roads
-            for j in range(len(vertices) - 1):
-                v1 = vertices[j]
-                v2 = vertices[j + 1]
-                
-                center_x = (v1[0] + v2[0]) / 2.0
-                center_y = (v1[1] + v2[1]) / 2.0
-                center_z = 0.02  # Slightly above ground
-                
-                dx = v2[0] - v1[0]
-                dy = v2[1] - v1[1]
-                length = math.sqrt(dx*dx + dy*dy)
-                angle = math.atan2(dy, dx)
-                
-                if length > 0.1:
-                    # Create visual
-                    visual = ET.SubElement(link, 'visual', name=f'visual_{j}')
-                    pose_vis = ET.SubElement(visual, 'pose')
-                    pose_vis.text = f'{center_x} {center_y} {center_z} 0 0 {angle}'
-                    geometry_vis = ET.SubElement(visual, 'geometry')
-                    box_vis = ET.SubElement(geometry_vis, 'box')
-                    size_vis = ET.SubElement(box_vis, 'size')
-                    size_vis.text = f'{length} {sidewalk["width"]} 0.05'
-                    material_vis = ET.SubElement(visual, 'material')
-                    # Use green for sidewalks (like in reference image)
-                    ambient = ET.SubElement(material_vis, 'ambient')
-                    ambient.text = '0.15 0.4 0.15 1'  # Dark green
-                    diffuse = ET.SubElement(material_vis, 'diffuse')
-                    diffuse.text = '0.2 0.5 0.2 1'  # Medium green
-                    specular = ET.SubElement(material_vis, 'specular')
-                    specular.text = '0.1 0.2 0.1 1'
+            center_z = 0.02  # Slightly above ground
+            for j, (center_x, center_y, _), length, angle in _segment_frames(vertices):
+                # Create visual
+                visual = ET.SubElement(link, 'visual', name=f'visual_{j}')
+                pose_vis = ET.SubElement(visual, 'pose')
+                pose_vis.text = f'{center_x} {center_y} {center_z} 0 0 {angle}'
+                geometry_vis = ET.SubElement(visual, 'geometry')
+                box_vis = ET.SubElement(geometry_vis, 'box')
+                size_vis = ET.SubElement(box_vis, 'size')
+                size_vis.text = f'{length} {sidewalk_width} 0.05'
+                material_vis = ET.SubElement(visual, 'material')
+                # Use green for sidewalks (like in reference image)
+                ambient = ET.SubElement(material_vis, 'ambient')
+                ambient.text = '0.15 0.4 0.15 1'  # Dark green
+                diffuse = ET.SubElement(material_vis, 'diffuse')
+                diffuse.text = '0.2 0.5 0.2 1'  # Medium green
+                specular = ET.SubElement(material_vis, 'specular')
+                specular.text = '0.1 0.2 0.1 1'
     
     # Add default camera pose
     gui = ET.SubElement(world, 'gui')
@@ -329,10 +332,9 @@ def create_sdf_world(geometries: Dict, world_name: str = "osm_city") -> str:
     pose_cam.text = '0 0 50 0 1.57 0'  # x, y, z, roll, pitch, yaw
     # View controller removed - not needed for SDF 1.11
     
-    # Convert to string
-    rough_string = ET.tostring(sdf, encoding='unicode')
-    reparsed = minidom.parseString(rough_string)
-    return reparsed.toprettyxml(indent='  ')
+    # Convert to string (indent in place rather than re-parsing through minidom)
+    ET.indent(sdf, space='  ')
+    return '<?xml version="1.0" ?>\n' + ET.tostring(sdf, encoding='unicode') + '\n'
 
 
 def generate_sdf_world(osm_file_path: str, output_path: str, world_name: str = "osm_city") -> None:
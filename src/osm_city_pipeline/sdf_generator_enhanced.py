@@ -2,10 +2,17 @@
 
 from typing import Dict, List, Tuple, Optional
 from xml.etree import ElementTree as ET
-from xml.dom import minidom
 from pathlib import Path
+import json
 import os
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from .sdf_world import create_world_element
+
 
 def create_enhanced_sdf_world(
     osm_file_path: str,
@@ -39,43 +46,9 @@ def create_enhanced_sdf_world(
     if not model_path.exists():
         raise FileNotFoundError(f"Model directory not found: {model_dir}")
     
-    # Create root element
-    sdf = ET.Element('sdf', version='1.11')
-    world = ET.SubElement(sdf, 'world', name=world_name)
-    
-    # Add physics (SDF 1.11 format)
-    physics = ET.SubElement(world, 'physics')
-    physics.set('type', 'ode')
-    physics.set('name', 'default')
-    max_step_size = ET.SubElement(physics, 'max_step_size')
-    max_step_size.text = '0.001'
-    real_time_factor = ET.SubElement(physics, 'real_time_factor')
-    real_time_factor.text = '1.0'
-    gravity_elem = ET.SubElement(physics, 'gravity')
-    gravity_elem.text = '0 0 -9.81'
-    
-    # Add plugins (Gazebo Harmonic format)
-    plugin_physics = ET.SubElement(world, 'plugin')
-    plugin_physics.set('filename', 'gz-sim-physics-system')
-    plugin_physics.set('name', 'gz::sim::systems::Physics')
-    
-    plugin_sensors = ET.SubElement(world, 'plugin')
-    plugin_sensors.set('filename', 'gz-sim-sensors-system')
-    plugin_sensors.set('name', 'gz::sim::systems::Sensors')
-    render_engine = ET.SubElement(plugin_sensors, 'render_engine')
-    render_engine.text = 'vulkan'
-    
-    plugin_scene = ET.SubElement(world, 'plugin')
-    plugin_scene.set('filename', 'gz-sim-scene-broadcaster-system')
-    plugin_scene.set('name', 'gz::sim::systems::SceneBroadcaster')
-    
-    plugin_user = ET.SubElement(world, 'plugin')
-    plugin_user.set('filename', 'gz-sim-user-commands-system')
-    plugin_user.set('name', 'gz::sim::systems::UserCommands')
-    
-    plugin_imu = ET.SubElement(world, 'plugin')
-    plugin_imu.set('filename', 'gz-sim-imu-system')
-    plugin_imu.set('name', 'gz::sim::systems::Imu')
+    # Create root element with physics and Gazebo Harmonic system plugins
+    sdf = create_world_element(world_name, render_engine='vulkan')
+    world = sdf.find('world')
     
     # Add scene
     scene = ET.SubElement(world, 'scene')
@@ -135,10 +108,9 @@ def create_enhanced_sdf_world(
     # The mesh model provides visual detail, but road coordinates remain accurate
     # for navigation and robot spawning
     
-    # Format XML
-    xml_str = ET.tostring(sdf, encoding='unicode')
-    reparsed = minidom.parseString(xml_str)
-    return reparsed.toprettyxml(indent='  ')
+    # Format XML (indent in place rather than re-parsing through minidom)
+    ET.indent(sdf, space='  ')
+    return '<?xml version="1.0" ?>\n' + ET.tostring(sdf, encoding='unicode') + '\n'
 
 
 def generate_enhanced_sdf_world(
@@ -175,10 +147,12 @@ def generate_enhanced_sdf_world(
     roads_file = maps_dir / f"{osm_stem}_roads.json"
     
     if roads_file.exists():
-        import json
         try:
-            with open(roads_file, 'r') as f:
-                road_metadata = json.load(f)
+            if orjson is not None:
+                road_metadata = orjson.loads(roads_file.read_bytes())
+            else:
+                with open(roads_file, 'rb') as f:
+                    road_metadata = json.load(f)
         except Exception as e:
             print(f"Warning: Could not load road metadata: {e}")
     
@@ -0,0 +1,101 @@
+"""Shared SDF world skeletons for Gazebo Harmonic worlds."""
+
+import copy
+from xml.etree import ElementTree as ET
+
+
+# World contents are kept as XML templates, parsed once at import; each world
+# gets a deep copy of a template's children.
+
+# Physics and system plugins common to every world we generate (SDF 1.11,
+# Gazebo Harmonic)
+_WORLD_HEADER_XML = (
+    '<world>'
+    '<physics type="ode" name="default">'
+    '<max_step_size>0.001</max_step_size>'
+    '<real_time_factor>1.0</real_time_factor>'
+    '<gravity>0 0 -9.81</gravity>'
+    '</physics>'
+    '<plugin filename="gz-sim-physics-system" name="gz::sim::systems::Physics" />'
+    '<plugin filename="gz-sim-sensors-system" name="gz::sim::systems::Sensors">'
+    '<render_engine>ogre2</render_engine>'
+    '</plugin>'
+    '<plugin filename="gz-sim-scene-broadcaster-system" name="gz::sim::systems::SceneBroadcaster" />'
+    '<plugin filename="gz-sim-user-commands-system" name="gz::sim::systems::UserCommands" />'
+    '<plugin filename="gz-sim-imu-system" name="gz::sim::systems::Imu" />'
+    '</world>'
+)
+
+_WORLD_HEADER = ET.fromstring(_WORLD_HEADER_XML)
+
+# Physics, scene and ground plane of the debug marker worlds
+_DEBUG_WORLD_HEADER_XML = (
+    '<world>'
+    '<physics type="ode"><gravity>0 0 -9.81</gravity></physics>'
+    '<scene>'
+    '<ambient>0.4 0.4 0.4 1</ambient>'
+    '<background>0.7 0.7 0.7 1</background>'
+    '</scene>'
+    '<model name="ground_plane">'
+    '<static>true</static>'
+    '<link name="link">'
+    '<collision name="collision">'
+    '<geometry><plane><normal>0 0 1</normal><size>1000 1000</size></plane></geometry>'
+    '</collision>'
+    '<visual name="visual">'
+    '<geometry><plane><normal>0 0 1</normal><size>1000 1000</size></plane></geometry>'
+    '</visual>'
+    '</link>'
+    '</model>'
+    '</world>'
+)
+
+_DEBUG_WORLD_HEADER = ET.fromstring(_DEBUG_WORLD_HEADER_XML)
+
+
+def _world_from_template(world_name: str, template: ET.Element) -> ET.Element:
+    """
+    Create an SDF root with a world holding a copy of a template's children.
+    
+    Args:
+        world_name: Name of the world
+        template: Parsed <world> template
+    
+    Returns:
+        The <sdf> root element; the world is its only child
+    """
+    sdf = ET.Element('sdf', version='1.11')
+    world = ET.SubElement(sdf, 'world', name=world_name)
+    world.extend(copy.deepcopy(child) for child in template)
+    
+    return sdf
+
+
+def create_world_element(world_name: str, render_engine: str = 'ogre2') -> ET.Element:
+    """
+    Create an SDF root with a world containing physics and system plugins.
+    
+    Args:
+        world_name: Name of the world
+        render_engine: Render engine for the sensors plugin (e.g. 'ogre2', 'vulkan')
+    
+    Returns:
+        The <sdf> root element; the world is its only child
+    """
+    sdf = _world_from_template(world_name, _WORLD_HEADER)
+    sdf.find('world/plugin/render_engine').text = render_engine
+    
+    return sdf
+
+
+def create_debug_world_element(world_name: str) -> ET.Element:
+    """
+    Create an SDF root with a world containing physics, scene and a ground plane.
+    
+    Args:
+        world_name: Name of the world
+    
+    Returns:
+        The <sdf> root element; the world is its only child
+    """
+    return _world_from_template(world_name, _DEBUG_WORLD_HEADER)
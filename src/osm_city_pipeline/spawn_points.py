@@ -0,0 +1,268 @@
+"""Load spawn_points.yaml files, with a JSON cache next to the YAML."""
+
+import json
+import os
+import sys
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import yaml
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Bump when the cache file layout changes, so stale caches are rebuilt
+_CACHE_VERSION = 1
+
+
+def _parse_spawn_points_yaml(spawn_file: str) -> Dict:
+    """
+    Parse a spawn points YAML file.
+    
+    Args:
+        spawn_file: Path to spawn_points.yaml
+    
+    Returns:
+        Parsed YAML document
+    """
+    # Prefer libyaml's C loader when PyYAML was built with it; a binary stream
+    # lets the loader detect and decode the encoding itself
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    with open(spawn_file, 'rb') as f:
+        return yaml.load(f, Loader=loader)
+
+
+def _add_derived_fields(spawn_data: Dict) -> Dict:
+    """
+    Add the lookup fields load_spawn_points provides to a parsed document.
+    
+    Args:
+        spawn_data: Parsed spawn points document
+    
+    Returns:
+        The same document, with a precomputed '_yaw' on each spawn point, an
+        id -> spawn point map as '_by_id', the street-matching index as
+        '_road_index'
+    """
+    # Thousands of spawn points share a few hundred road names; keep a single
+    # string object per name
+    spawn_points = spawn_data.get('spawn_points') or []
+    by_id = {}
+    for sp in spawn_points:
+        # First spawn point wins if an id is repeated
+        by_id.setdefault(sp.get('id'), sp)
+        
+        road_name = sp.get('road_name')
+        if isinstance(road_name, str):
+            sp['road_name'] = sys.intern(road_name)
+        
+        # Flatten the optional orientation/yaw lookup once per spawn point
+        sp['_yaw'] = (sp.get('orientation') or {}).get('yaw', 0.0)
+    
+    spawn_data['_by_id'] = by_id
+    
+    # Build the street-matching index once per load instead of on every query
+    spawn_data['_road_index'] = index_by_road(spawn_points)
+    
+    return spawn_data
+
+
+def _read_cache(cache_file: str, cache_key: List[int]) -> Optional[Dict]:
+    """
+    Read a spawn points cache file written by _write_cache.
+    
+    Args:
+        cache_file: Path to the cache file
+        cache_key: Expected [version, mtime_ns, size] of the YAML
+    
+    Returns:
+        The cached document, or None if the cache is missing, stale or unreadable
+    """
+    try:
+        with open(cache_file, 'rb') as f:
+            # The first line holds the key; only parse the payload if it matches
+            if json.loads(f.readline()) != cache_key:
+                return None
+            payload = f.read()
+        spawn_data = orjson.loads(payload) if orjson is not None else json.loads(payload)
+    except (OSError, ValueError):
+        # Missing, unreadable or corrupt cache
+        return None
+    
+    return spawn_data if isinstance(spawn_data, dict) else None
+
+
+def _write_cache(cache_file: str, cache_key: List[int], spawn_data: Dict) -> None:
+    """
+    Write a spawn points cache file atomically; failing to write it is not an error.
+    
+    Args:
+        cache_file: Path to the cache file
+        cache_key: [version, mtime_ns, size] of the YAML
+        spawn_data: Parsed YAML document (without derived fields)
+    """
+    tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+    try:
+        if orjson is not None:
+            payload = orjson.dumps(spawn_data)
+        else:
+            payload = json.dumps(spawn_data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        with open(tmp_file, 'wb') as f:
+            f.write(json.dumps(cache_key).encode('ascii') + b'\n')
+            f.write(payload)
+        os.replace(tmp_file, cache_file)
+    except (OSError, TypeError, ValueError):
+        # Unwritable directory, or YAML values JSON cannot represent
+        try:
+            os.unlink(tmp_file)
+        except OSError:
+            pass
+
+
+def load_spawn_points(spawn_file: str) -> Dict:
+    """
+    Load a spawn points YAML file.
+    
+    The parsed document is cached as JSON next to the YAML
+    (<spawn_file>.cache.json), tagged with the YAML's mtime (ns) and size. The
+    cache is reused while both still match, so repeated CLI invocations skip
+    YAML parsing; anything wrong with the cache falls back to the YAML.
+    
+    Args:
+        spawn_file: Path to spawn_points.yaml
+    
+    Returns:
+        Parsed YAML document (with 'spawn_points' list, each carrying '_yaw'),
+        plus a '_road_index' entry holding index_by_road(spawn_points) for
+        match_street and the '_by_id' map
+    """
+    cache_file = f"{spawn_file}.cache.json"
+    source_stat = os.stat(spawn_file)
+    cache_key = [_CACHE_VERSION, source_stat.st_mtime_ns, source_stat.st_size]
+    
+    spawn_data = _read_cache(cache_file, cache_key)
+    if spawn_data is not None:
+        try:
+            return _add_derived_fields(spawn_data)
+        except Exception:
+            # Valid JSON but not a spawn points document: rebuild from the YAML
+            pass
+    
+    spawn_data = _parse_spawn_points_yaml(spawn_file)
+    _write_cache(cache_file, cache_key, spawn_data)
+    
+    return _add_derived_fields(spawn_data)
+
+
+def index_by_road(spawn_points: List[Dict]) -> Dict[str, List[int]]:
+    """
+    Group spawn points by case-folded road name.
+    
+    Args:
+        spawn_points: List of spawn point dictionaries
+    
+    Returns:
+        Dictionary mapping case-folded road name to the indices of its spawn points
+    """
+    index = {}
+    folded = {}  # road name -> case-folded road name, computed once per name
+    
+    for i, sp in enumerate(spawn_points):
+        road_name = sp.get('road_name', '')
+        road_key = folded.get(road_name)
+        if road_key is None:
+            road_key = folded[road_name] = road_name.casefold()
+        index.setdefault(road_key, []).append(i)
+    
+    return index
+
+
+def match_street(spawn_points: List[Dict], street_name: str,
+                 index: Optional[Dict[str, List[int]]] = None) -> List[Dict]:
+    """
+    Find spawn points on a street (case-insensitive substring match either way).
+    
+    Each unique road name is compared once instead of every spawn point.
+    
+    Args:
+        spawn_points: List of spawn point dictionaries
+        street_name: Street name to search for
+        index: Road name index from index_by_road (built if not given)
+    
+    Returns:
+        Matching spawn points, in their original order
+    """
+    if index is None:
+        index = index_by_road(spawn_points)
+    
+    # casefold (unlike lower) also matches e.g. "Straße" against "strasse"
+    street_key = street_name.casefold()
+    indices = []
+    
+    for road_key, road_indices in index.items():
+        if street_key in road_key or road_key in street_key:
+            indices.extend(road_indices)
+    
+    indices.sort()
+    return [spawn_points[i] for i in indices]
+
+
+def spawn_arrays(spawn_points: List[Dict]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Gather spawn point positions and yaws into NumPy arrays.
+    
+    Args:
+        spawn_points: List of spawn point dictionaries (as returned by load_spawn_points)
+    
+    Returns:
+        Tuple of (east, north, up, yaw) float64 arrays, in spawn point order
+    """
+    count = len(spawn_points)
+    positions = [sp['position'] for sp in spawn_points]
+    
+    east, north = plane_arrays(spawn_points)
+    up = np.fromiter((pos['up'] for pos in positions), dtype=np.float64, count=count)
+    yaw = np.fromiter((sp['_yaw'] for sp in spawn_points), dtype=np.float64, count=count)
+    
+    return east, north, up, yaw
+
+
+def plane_arrays(spawn_points: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Gather spawn point east/north positions into NumPy arrays.
+    
+    Unlike spawn_arrays this never reads 'up' or the yaw, so it also works on
+    spawn files whose positions only carry east and north.
+    
+    Args:
+        spawn_points: List of spawn point dictionaries
+    
+    Returns:
+        Tuple of (east, north) float64 arrays, in spawn point order
+    """
+    count = len(spawn_points)
+    east = np.fromiter((sp['position']['east'] for sp in spawn_points), dtype=np.float64, count=count)
+    north = np.fromiter((sp['position']['north'] for sp in spawn_points), dtype=np.float64, count=count)
+    
+    return east, north
+
+
+def map_center(spawn_points: List[Dict]) -> Optional[Tuple[float, float]]:
+    """
+    Center of the spawn points' bounding box.
+    
+    Args:
+        spawn_points: List of spawn point dictionaries
+    
+    Returns:
+        (east, north) of the bounding box center, or None if there are no spawn points
+    """
+    if not spawn_points:
+        return None
+    
+    east, north = plane_arrays(spawn_points)
+    return ((float(east.min()) + float(east.max())) / 2,
+            (float(north.min()) + float(north.max())) / 2)
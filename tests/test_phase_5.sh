@@ -178,6 +178,274 @@ run_test "Phase 4 + Phase 5 integration" \
 run_test "All phases work together" \
     "python3 -c 'import sys; sys.path.insert(0, \"src\"); from osm_city_pipeline import gis_projection, road_extractor, sdf_generator, metadata_exporter; assert all([gis_projection, road_extractor, sdf_generator, metadata_exporter])'"
 
+echo ""
+echo "=== SPAWN POINTS CACHE TESTS ==="
+echo ""
+
+# Test 21: Warm load is served from the JSON cache
+run_test "Spawn points cache: cold load then warm load" \
+    "python3 << 'PYEOF'
+import sys
+sys.path.insert(0, 'src')
+import os
+import shutil
+import tempfile
+from osm_city_pipeline import spawn_points
+
+tmp_dir = tempfile.mkdtemp()
+spawn_file = os.path.join(tmp_dir, 'spawn_points.yaml')
+shutil.copy('maps/bari_spawn_points.yaml', spawn_file)
+
+# Cold load parses the YAML and writes the cache next to it
+cold = spawn_points.load_spawn_points(spawn_file)
+assert os.path.exists(spawn_file + '.cache.json')
+
+# Warm load must not parse the YAML again
+def fail_parse(path):
+    raise AssertionError('YAML parsed on a warm load')
+spawn_points._parse_spawn_points_yaml = fail_parse
+warm = spawn_points.load_spawn_points(spawn_file)
+assert warm == cold
+
+shutil.rmtree(tmp_dir)
+PYEOF
+"
+
+# Test 22: Editing the YAML invalidates the cache
+run_test "Spawn points cache: YAML edits invalidate the cache" \
+    "python3 << 'PYEOF'
+import sys
+sys.path.insert(0, 'src')
+import os
+import shutil
+import tempfile
+from osm_city_pipeline.spawn_points import load_spawn_points
+
+SPAWN_YAML = '''spawn_points:
+- id: 0
+  name: spawn_point_0
+  position: {east: 1.5, north: 2.0, up: 0.0}
+  orientation: {yaw: 0.5}
+  road_name: Via Test
+'''
+
+tmp_dir = tempfile.mkdtemp()
+spawn_file = os.path.join(tmp_dir, 'spawn_points.yaml')
+with open(spawn_file, 'w') as f:
+    f.write(SPAWN_YAML)
+assert load_spawn_points(spawn_file)['spawn_points'][0]['position']['east'] == 1.5
+
+# Edit that changes the file size
+with open(spawn_file, 'w') as f:
+    f.write(SPAWN_YAML.replace('east: 1.5', 'east: 10.5'))
+assert load_spawn_points(spawn_file)['spawn_points'][0]['position']['east'] == 10.5
+
+# Edit that keeps the size; only the mtime differs from the cached key
+stat = os.stat(spawn_file)
+with open(spawn_file, 'w') as f:
+    f.write(SPAWN_YAML.replace('east: 1.5', 'east: 20.5'))
+assert os.path.getsize(spawn_file) == stat.st_size
+os.utime(spawn_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+assert load_spawn_points(spawn_file)['spawn_points'][0]['position']['east'] == 20.5
+
+shutil.rmtree(tmp_dir)
+PYEOF
+"
+
+# Test 23: A corrupt or truncated cache falls back to the YAML
+run_test "Spawn points cache: corrupt cache falls back to YAML" \
+    "python3 << 'PYEOF'
+import sys
+sys.path.insert(0, 'src')
+import json
+import os
+import shutil
+import tempfile
+from osm_city_pipeline.spawn_points import load_spawn_points
+
+tmp_dir = tempfile.mkdtemp()
+spawn_file = os.path.join(tmp_dir, 'spawn_points.yaml')
+cache_file = spawn_file + '.cache.json'
+shutil.copy('maps/bari_spawn_points.yaml', spawn_file)
+
+reference = load_spawn_points(spawn_file)
+with open(cache_file, 'rb') as f:
+    good_cache = f.read()
+
+NL = chr(10).encode()
+header = good_cache[:good_cache.index(NL) + 1]
+corrupt_caches = [
+    b'',                                                # empty
+    b'cos' + NL + b'system' + NL + b'.',                # pickle payload
+    good_cache[:len(good_cache) // 2],                  # truncated
+    header,                                             # key without payload
+    header + b'[1, 2, 3]',                              # not a document
+    header + json.dumps({'spawn_points': [3]}).encode(),
+]
+for corrupt in corrupt_caches:
+    with open(cache_file, 'wb') as f:
+        f.write(corrupt)
+    assert load_spawn_points(spawn_file) == reference
+
+shutil.rmtree(tmp_dir)
+PYEOF
+"
+
+# Test 24: An unwritable cache location does not break loading
+run_test "Spawn points cache: unwritable directory still loads" \
+    "python3 << 'PYEOF'
+import sys
+sys.path.insert(0, 'src')
+import os
+import shutil
+import tempfile
+from osm_city_pipeline.spawn_points import load_spawn_points
+
+tmp_dir = tempfile.mkdtemp()
+spawn_file = os.path.join(tmp_dir, 'spawn_points.yaml')
+cache_file = spawn_file + '.cache.json'
+shutil.copy('maps/bari_spawn_points.yaml', spawn_file)
+
+# Read-only directory (root ignores the mode, so the cache may still appear)
+os.chmod(tmp_dir, 0o555)
+try:
+    data = load_spawn_points(spawn_file)
+finally:
+    os.chmod(tmp_dir, 0o755)
+assert len(data['spawn_points']) > 0
+
+# A directory in place of the cache file cannot be read or replaced
+if os.path.exists(cache_file):
+    os.remove(cache_file)
+os.mkdir(cache_file)
+for _ in range(2):
+    data = load_spawn_points(spawn_file)
+    assert len(data['spawn_points']) > 0
+assert sorted(os.listdir(tmp_dir)) == ['spawn_points.yaml', 'spawn_points.yaml.cache.json']
+
+shutil.rmtree(tmp_dir)
+PYEOF
+"
+
+echo ""
+echo "=== SPAWN POINT GENERATION REGRESSION TESTS ==="
+echo ""
+
+# Test 25: Hand-made centerlines (known spawn points, spacing 10m)
+run_test "Spawn points on hand-made centerlines match known output" \
+    "python3 << 'PYEOF'
+import sys
+sys.path.insert(0, 'src')
+import numpy as np
+from osm_city_pipeline.gis_projection import ENUProjection
+from osm_city_pipeline.metadata_exporter import generate_spawn_points
+
+# way_id -> ENU centerline
+centerlines = {
+    1: [(0, 0, 0), (25, 0, 0)],                        # straight road
+    2: [(0, 0, 0), (0.004, 0, 0), (0.004, 12, 0)],     # segment under 1cm
+    3: [(0, 0, 0), (3, 4, 1)],                         # shorter than the spacing
+    4: [(5, 5, 0)],                                    # single point road
+    5: [(0, 0, 0), (0, 0, 0), (10, 0, 0), (10, 10, 0)],  # zero-length segment, spawn at a vertex
+    6: [(0, 0, 0), (9.998, 0, 0), (10, 0.003, 0), (10, 15, 0)],  # spawn distance inside a segment under 1cm
+}
+lane_centerlines = [{'way_id': way_id, 'name': f'road_{way_id}', 'highway_type': 'residential'}
+                    for way_id in centerlines]
+enu_centerlines = [np.asarray(points, dtype=np.float64) for points in centerlines.values()]
+
+# (id, way_id, east, north, up, yaw)
+expected = [
+    (0, 1, 0.0, 0.0, 0.0, 0.0),
+    (1, 1, 10.0, 0.0, 0.0, 0.0),
+    (2, 1, 20.0, 0.0, 0.0, 0.0),
+    (3, 1, 25.0, 0.0, 0.0, 0.0),
+    (4, 2, 0.0, 0.0, 0.0, 0.0),
+    (5, 2, 0.004, 9.996, 0.0, 1.570796),
+    (6, 2, 0.004, 12.0, 0.0, 1.570796),
+    (7, 3, 0.0, 0.0, 0.0, 0.927295),
+    (8, 3, 3.0, 4.0, 1.0, 0.927295),
+    (9, 5, 0.0, 0.0, 0.0, 0.0),
+    (10, 5, 10.0, 0.0, 0.0, 1.570796),
+    (11, 5, 10.0, 10.0, 0.0, 1.570796),
+    (12, 6, 0.0, 0.0, 0.0, 0.0),
+    (13, 6, 10.0, 0.001394, 0.0, 1.570796),
+    (14, 6, 10.0, 10.001394, 0.0, 1.570796),
+    (15, 6, 10.0, 15.0, 0.0, 1.570796),
+]
+
+# Centerlines are given in ENU already, so the projection is not used
+enu = ENUProjection(41.122, 16.867)
+spawn_points = generate_spawn_points(lane_centerlines, enu, 10.0, enu_centerlines)
+actual = [(sp['id'], sp['way_id'], sp['position']['east'], sp['position']['north'],
+           sp['position']['up'], sp['orientation']['yaw']) for sp in spawn_points]
+assert actual == expected, actual
+for sp in spawn_points:
+    assert sp['name'] == 'spawn_point_' + str(sp['id'])
+    assert sp['road_name'] == 'road_' + str(sp['way_id'])
+PYEOF
+"
+
+# Test 26: Known spawn points from maps/bari.osm
+run_test "Spawn points from bari.osm match known output" \
+    "python3 << 'PYEOF'
+import sys
+sys.path.insert(0, 'src')
+from osm_city_pipeline.gis_projection import create_enu_from_osm
+from osm_city_pipeline.road_extractor import extract_road_metadata
+from osm_city_pipeline.metadata_exporter import generate_spawn_points
+
+enu = create_enu_from_osm('maps/bari.osm')
+lane_centerlines = extract_road_metadata('maps/bari.osm')['lane_centerlines']
+spawn_points = generate_spawn_points(lane_centerlines, enu, 10.0)
+
+# (id, way_id, east, north, up, yaw)
+expected = [
+    (0, 24884042, 445.473142, 244.726093, 0.0, -3.058752),
+    (1, 24884042, 435.507435, 243.898636, 0.0, -3.058752),
+    (2, 24884042, 425.536081, 243.14265, 0.0, -3.06673),
+    (3, 24884042, 415.56409, 242.394724, 0.0, -3.06673),
+    (1396, 1068572560, 452.170758, 169.596915, 0.0, 0.07748),
+]
+
+assert len(spawn_points) == 1397, len(spawn_points)
+actual = [(sp['id'], sp['way_id'], sp['position']['east'], sp['position']['north'],
+           sp['position']['up'], sp['orientation']['yaw'])
+          for sp in spawn_points[:4] + spawn_points[-1:]]
+assert actual == expected, actual
+PYEOF
+"
+
+# Test 27: Spawn files whose positions carry only east/north still load
+run_test "Spawn points without 'up' load and give a map center" \
+    "python3 << 'PYEOF'
+import sys
+sys.path.insert(0, 'src')
+import os
+import shutil
+import tempfile
+import yaml
+from osm_city_pipeline.spawn_points import load_spawn_points, map_center, match_street
+
+tmp_dir = tempfile.mkdtemp()
+spawn_file = os.path.join(tmp_dir, 'spawn_points.yaml')
+with open(spawn_file, 'w') as f:
+    yaml.safe_dump({'spawn_points': [
+        {'id': 0, 'road_name': 'Via Roma', 'position': {'east': 1.0, 'north': 2.0}},
+        {'id': 1, 'road_name': 'Via Roma', 'position': {'east': 5.0, 'north': 8.0}},
+    ]}, f)
+
+# Cold load, then warm load from the cache
+for _ in range(2):
+    spawn_data = load_spawn_points(spawn_file)
+    assert len(match_street(spawn_data['spawn_points'], 'roma', spawn_data['_road_index'])) == 2
+    assert map_center(spawn_data['spawn_points']) == (3.0, 5.0)
+
+assert map_center([]) is None
+
+shutil.rmtree(tmp_dir)
+PYEOF
+"
+
 echo ""
 echo "============================================================"
 echo "TEST SUMMARY"